@@ -6,21 +6,201 @@
 一键将Python代码编译为Windows可执行文件
 """
 
+import base64
+import importlib.util
 import os
 import sys
 import shutil
 import subprocess
 import tempfile
+import threading
+import urllib.request
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
 
+# 默认图标：32x32蓝底白方块（PNG格式的ICO），预先生成以免构建时导入PIL
+_DEFAULT_ICON_B64 = (
+    b'AAABAAEAICAAAAEAIABuAAAAFgAAAIlQTkcNChoKAAAADUlIRFIAAAAgAAAAIAgGAAAAc3p6'
+    b'9AAAADVJREFUeNrt1jENAAAIA0FkIBvHYIIEhmvy+42NrO7LAgAA4D1gYwAAAAAAAAAALhkA'
+    b'wGvAAEZcGsswV0XAAAAAAElFTkSuQmCC'
+)
+
+@lru_cache(maxsize=1)
 def get_base_dir():
-    """获取脚本所在的基础目录"""
+    """获取脚本所在的基础目录（结果在进程内缓存）"""
     # 如果被打包成exe，使用sys.executable的路径
     if getattr(sys, 'frozen', False):
         return os.path.dirname(sys.executable)
     # 否则使用脚本文件所在目录
     return os.path.dirname(os.path.abspath(__file__))
 
+# 单次运行内的文件状态缓存，main()开始时重置
+_stat_cache = {}
+# 已完整枚举过的目录，其中未出现的文件可直接判定为不存在
+_scanned_dirs = set()
+
+def cached_stat(path):
+    """带缓存的os.stat，文件不存在时返回None"""
+    try:
+        return _stat_cache[path]
+    except KeyError:
+        pass
+    if os.path.dirname(path) in _scanned_dirs:
+        return None
+    try:
+        result = os.stat(path)
+    except OSError:
+        result = None
+    _stat_cache[path] = result
+    return result
+
+def cached_exists(path):
+    """带缓存的os.path.exists"""
+    return cached_stat(path) is not None
+
+def invalidate_stat_cache(path):
+    """文件被写入或删除后使缓存失效"""
+    _stat_cache.pop(path, None)
+    _scanned_dirs.discard(os.path.dirname(path))
+
+def scan_directory(dir_path):
+    """用一次os.scandir枚举目录，预填充其中所有条目的状态缓存
+
+    返回 {名称: DirEntry}。Windows下scandir的结果直接来自FindFirstFile，
+    无需逐个文件再调用stat。
+    """
+    entries = {}
+    try:
+        with os.scandir(dir_path) as it:
+            for entry in it:
+                entries[entry.name] = entry
+                try:
+                    _stat_cache[entry.path] = entry.stat()
+                except OSError:
+                    _stat_cache[entry.path] = None
+    except OSError:
+        return entries
+    _scanned_dirs.add(dir_path)
+    return entries
+
+# 子进程创建参数：close_fds=False 可走 posix_spawn 快速路径，
+# Windows 下不为子进程分配控制台窗口
+SUBPROCESS_KWARGS = {'close_fds': False}
+if os.name == 'nt':
+    SUBPROCESS_KWARGS['creationflags'] = subprocess.CREATE_NO_WINDOW
+
+# pip子进程命令。安装不使用隔离模式：site-packages不可写时pip需要自动改为--user安装，
+# 且要与本进程的依赖检查看到相同的用户site目录
+PIP_COMMAND = [sys.executable, "-m", "pip"]
+# 只读的pip查询使用 -I 隔离模式，跳过用户site目录与PYTHON*环境变量，缩短解释器启动
+PIP_QUERY_COMMAND = [sys.executable, "-I", "-m", "pip"]
+
+# pip下载缓存和本地wheel仓库固定在项目目录下，多次编译之间复用
+PIP_CACHE_DIR = os.path.join(get_base_dir(), ".pip-cache")
+WHEELS_DIR = os.path.join(get_base_dir(), ".wheels")
+# 关闭pip每次启动时联网检查自身新版本
+PIP_ENV = dict(os.environ, PIP_CACHE_DIR=PIP_CACHE_DIR,
+               PIP_DISABLE_PIP_VERSION_CHECK="1")
+
+# pip并行下载参数缓存（None表示尚未检测）
+_parallel_download_args = None
+
+def get_parallel_download_args():
+    """检测pip是否支持并行下载，返回需要追加到pip install的参数"""
+    global _parallel_download_args
+    if _parallel_download_args is not None:
+        return _parallel_download_args
+    
+    _parallel_download_args = []
+    try:
+        # 只有当前pip的帮助信息中声明了该选项才启用，旧版本pip会直接报错
+        result = subprocess.run(
+            PIP_QUERY_COMMAND + ["install", "--help"],
+            capture_output=True,
+            text=True,
+            timeout=60,
+            env=PIP_ENV,
+            **SUBPROCESS_KWARGS
+        )
+        if result.returncode == 0 and "--parallel-downloads" in result.stdout:
+            workers = min(8, (os.cpu_count() or 1) * 2)
+            _parallel_download_args = ["--parallel-downloads", str(workers)]
+            print(f"✓ pip支持并行下载，并发数: {workers}")
+    except Exception as e:
+        print(f"⚠  检测pip并行下载支持失败: {e}")
+    
+    return _parallel_download_args
+
+# 上次安装成功的镜像缓存文件，后续编译优先使用
+MIRROR_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".smartboard_mirror")
+
+def probe_mirror(mirror):
+    """探测镜像是否可用（HEAD请求/simple/）"""
+    request = urllib.request.Request(mirror, method="HEAD")
+    with urllib.request.urlopen(request, timeout=3) as response:
+        return response.status == 200
+
+def rank_mirrors(mirrors):
+    """并发探测所有镜像，返回 (全部镜像的尝试顺序, 探测可用的镜像)
+
+    两个列表都按响应先后排序，上次安装成功且本次探测可用的镜像排在最前
+    """
+    try:
+        with open(MIRROR_CACHE_FILE, 'r', encoding='utf-8') as f:
+            cached_mirror = f.read().strip()
+    except OSError:
+        cached_mirror = None
+    
+    print("正在探测最快的镜像...")
+    reachable = []
+    with ThreadPoolExecutor(max_workers=len(mirrors)) as executor:
+        futures = {executor.submit(probe_mirror, mirror): mirror for mirror in mirrors}
+        for future in as_completed(futures):
+            try:
+                if future.result():
+                    reachable.append(futures[future])
+            except Exception:
+                pass
+    
+    if cached_mirror in reachable:
+        reachable.remove(cached_mirror)
+        reachable.insert(0, cached_mirror)
+        print(f"✓ 使用缓存的镜像: {cached_mirror}")
+    elif reachable:
+        print(f"✓ 最快的镜像: {reachable[0]}")
+    else:
+        print("⚠  所有镜像探测失败")
+    
+    # 探测失败的镜像放在最后，逐个尝试时仍保留重试机会
+    return reachable + [m for m in mirrors if m not in reachable], reachable
+
+def remember_mirror(mirror):
+    """缓存安装成功的镜像"""
+    try:
+        with open(MIRROR_CACHE_FILE, 'w', encoding='utf-8') as f:
+            f.write(mirror)
+    except OSError:
+        pass
+
+def mirror_index_args(mirrors):
+    """生成单次pip调用使用全部镜像的参数：首个为主索引，其余为附加索引"""
+    args = ["--index-url", mirrors[0]]
+    for mirror in mirrors[1:]:
+        args += ["--extra-index-url", mirror]
+    for mirror in mirrors:
+        args += ["--trusted-host", mirror.split("//")[1].split("/")[0]]
+    return args
+
+# 多线程检查时保证每行输出完整
+_print_lock = threading.Lock()
+
+def locked_print(*args, **kwargs):
+    """加锁的print"""
+    with _print_lock:
+        print(*args, **kwargs)
+
 def check_environment():
     """检查编译环境"""
     print("=" * 60)
@@ -38,17 +218,20 @@ def check_environment():
     
     print(f"✓ Python版本: {sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}")
     
-    # 检查必需工具
+    # 检查必需工具（并发在PATH中查找，无需启动子进程）
     required_tools = ['pip', 'pyinstaller']
-    for tool in required_tools:
-        try:
-            subprocess.run([tool, '--version'], capture_output=True, check=True)
-            print(f"✓ {tool} 已安装")
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            print(f"❌❌ {tool} 未安装或不在PATH中")
-            return False
+    all_found = True
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = {executor.submit(shutil.which, tool): tool for tool in required_tools}
+        for future in as_completed(futures):
+            tool = futures[future]
+            if future.result():
+                locked_print(f"✓ {tool} 已安装")
+            else:
+                locked_print(f"❌❌ {tool} 未安装或不在PATH中")
+                all_found = False
     
-    return True
+    return all_found
 
 def install_dependencies():
     """安装依赖包 - 使用国内镜像源"""
@@ -61,7 +244,7 @@ def install_dependencies():
     
     print(f"查找requirements.txt: {requirements_file}")
     
-    if not os.path.exists(requirements_file):
+    if not cached_exists(requirements_file):
         print(f"❌❌ 找不到requirements.txt文件，尝试在以下位置查找:")
         print(f"  1. {requirements_file}")
         print(f"  2. {os.path.join(os.getcwd(), 'requirements.txt')}")
@@ -69,14 +252,14 @@ def install_dependencies():
         
         # 尝试在当前工作目录查找
         cwd_requirements = os.path.join(os.getcwd(), "requirements.txt")
-        if os.path.exists(cwd_requirements):
+        if cached_exists(cwd_requirements):
             print(f"✓ 在当前工作目录找到requirements.txt")
             requirements_file = cwd_requirements
         else:
             # 尝试在父目录查找（如果脚本在子目录中）
             parent_dir = os.path.dirname(base_dir)
             parent_requirements = os.path.join(parent_dir, "requirements.txt")
-            if os.path.exists(parent_requirements):
+            if cached_exists(parent_requirements):
                 print(f"✓ 在父目录找到requirements.txt")
                 requirements_file = parent_requirements
             else:
@@ -85,13 +268,86 @@ def install_dependencies():
     
     print(f"✓ 使用依赖文件: {requirements_file}")
     
+    # 本地检查已安装的版本，全部满足时无需启动pip
+    unsatisfied = get_unsatisfied_requirements(requirements_file)
+    if unsatisfied is None:
+        return install_requirements_file(requirements_file)
+    
+    if not unsatisfied:
+        print("✓ 所有依赖已满足，跳过安装")
+        return True
+    
+    # 只安装未满足的依赖
+    print(f"需要安装的依赖: {', '.join(unsatisfied)}")
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', encoding='utf-8',
+                                     delete=False) as f:
+        f.write("\n".join(unsatisfied) + "\n")
+        temp_requirements = f.name
+    try:
+        return install_requirements_file(temp_requirements)
+    finally:
+        os.remove(temp_requirements)
+
+def get_unsatisfied_requirements(requirements_file):
+    """检查requirements.txt中尚未满足的依赖，无法检查时返回None"""
+    try:
+        from importlib import metadata
+    except ImportError:
+        return None
+    try:
+        from packaging.requirements import Requirement
+    except ImportError:
+        try:
+            from pip._vendor.packaging.requirements import Requirement
+        except ImportError:
+            return None
+    
+    try:
+        with open(requirements_file, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return None
+    
+    unsatisfied = []
+    for line in lines:
+        line = line.split('#', 1)[0].strip()
+        if not line:
+            continue
+        # pip选项（-r、-e、--index-url等）无法在本地检查
+        if line.startswith('-'):
+            return None
+        try:
+            requirement = Requirement(line)
+        except Exception:
+            return None
+        
+        if requirement.marker and not requirement.marker.evaluate():
+            continue
+        
+        try:
+            version = metadata.version(requirement.name)
+        except metadata.PackageNotFoundError:
+            unsatisfied.append(line)
+            continue
+        
+        if not requirement.specifier.contains(version, prereleases=True):
+            unsatisfied.append(line)
+    
+    return unsatisfied
+
+def install_requirements_file(requirements_file):
+    """从镜像源安装依赖文件中的包"""
     # 国内镜像源列表
     mirrors = [
         "https://pypi.tuna.tsinghua.edu.cn/simple/",
         "https://mirrors.aliyun.com/pypi/simple/",
-        "https://pypi.douban.com/simple/",
         "https://pypi.mirrors.ustc.edu.cn/simple/"
     ]
+    # 本地wheel仓库可用时先离线安装，完全不访问网络
+    if install_from_local_wheels(requirements_file):
+        return True
+    
+    mirrors, _ = rank_mirrors(mirrors)
     
     success = False
     last_error = None
@@ -100,15 +356,20 @@ def install_dependencies():
         try:
             print(f"正在尝试从 {mirror} 安装依赖...")
             result = subprocess.run(
-                [sys.executable, "-m", "pip", "install", "-r", requirements_file, 
-                 "-i", mirror, "--trusted-host", mirror.split("//")[1].split("/")[0]],
+                PIP_COMMAND + ["install", "-r", requirements_file, 
+                 "-i", mirror, "--trusted-host", mirror.split("//")[1].split("/")[0]]
+                + get_parallel_download_args(),
                 capture_output=True,
                 text=True,
-                timeout=300  # 5分钟超时
+                timeout=300,  # 5分钟超时
+                env=PIP_ENV,
+                **SUBPROCESS_KWARGS
             )
             
             if result.returncode == 0:
                 print("✓ 依赖安装成功")
+                remember_mirror(mirror)
+                download_wheels(requirements_file, mirror)
                 success = True
                 break
             else:
@@ -127,10 +388,13 @@ def install_dependencies():
         print("所有镜像都失败，尝试使用默认源...")
         try:
             result = subprocess.run(
-                [sys.executable, "-m", "pip", "install", "-r", requirements_file],
+                PIP_COMMAND + ["install", "-r", requirements_file]
+                + get_parallel_download_args(),
                 capture_output=True,
                 text=True,
-                timeout=300
+                timeout=300,
+                env=PIP_ENV,
+                **SUBPROCESS_KWARGS
             )
             
             if result.returncode == 0:
@@ -148,6 +412,48 @@ def install_dependencies():
     
     return True
 
+def install_from_local_wheels(requirements_file):
+    """从本地wheel仓库离线安装，仓库不存在或缺少包时返回False"""
+    if not cached_exists(WHEELS_DIR):
+        return False
+    
+    print(f"尝试从本地wheel仓库安装: {WHEELS_DIR}")
+    try:
+        result = subprocess.run(
+            PIP_COMMAND + ["install", "--no-index", "--find-links", WHEELS_DIR,
+             "-r", requirements_file],
+            capture_output=True,
+            text=True,
+            timeout=300,
+            env=PIP_ENV,
+            **SUBPROCESS_KWARGS
+        )
+        if result.returncode == 0:
+            print("✓ 依赖安装成功（本地wheel仓库）")
+            return True
+        print("⚠  本地wheel仓库不完整，改为在线安装")
+    except Exception as e:
+        print(f"⚠  本地wheel仓库安装出错: {e}")
+    return False
+
+def download_wheels(requirements_file, mirror):
+    """把依赖的wheel下载到本地仓库，供后续编译离线安装"""
+    try:
+        result = subprocess.run(
+            PIP_COMMAND + ["download", "-r", requirements_file, "-d", WHEELS_DIR,
+             "-i", mirror, "--trusted-host", mirror.split("//")[1].split("/")[0]],
+            capture_output=True,
+            text=True,
+            timeout=300,
+            env=PIP_ENV,
+            **SUBPROCESS_KWARGS
+        )
+        invalidate_stat_cache(WHEELS_DIR)
+        if result.returncode == 0:
+            print(f"✓ 已缓存依赖wheel到: {WHEELS_DIR}")
+    except Exception as e:
+        print(f"⚠  缓存依赖wheel失败: {e}")
+
 def install_default_dependencies():
     """安装默认依赖包"""
     print("\n使用默认依赖列表安装...")
@@ -155,32 +461,37 @@ def install_default_dependencies():
     default_dependencies = [
         'PyQt5>=5.15.0',
         'pywin32>=300',
-        'psutil>=5.8.0',
+        'psutil>=6.0.0',
         'Pillow>=8.3.0'
     ]
     
     mirrors = [
         "https://pypi.tuna.tsinghua.edu.cn/simple/",
-        "https://mirrors.aliyun.com/pypi/simple/",
-        "https://pypi.douban.com/simple/"
+        "https://mirrors.aliyun.com/pypi/simple/"
     ]
+    _, reachable = rank_mirrors(mirrors)
     
-    for mirror in mirrors:
+    # 探测可用的镜像放在同一次pip调用中，只启动一次解释器。
+    # pip会向每个索引查询每个包，不可达的索引会拖慢整次安装，所以只传入探测通过的镜像
+    if reachable:
         try:
-            print(f"尝试从 {mirror} 安装默认依赖...")
+            print(f"尝试从镜像源安装默认依赖（主索引: {reachable[0]}）...")
             result = subprocess.run(
-                [sys.executable, "-m", "pip", "install"] + default_dependencies + 
-                ["-i", mirror, "--trusted-host", mirror.split("//")[1].split("/")[0]],
+                PIP_COMMAND + ["install"] + default_dependencies
+                + mirror_index_args(reachable)
+                + get_parallel_download_args(),
                 capture_output=True,
                 text=True,
-                timeout=300
+                timeout=300,
+                env=PIP_ENV,
+                **SUBPROCESS_KWARGS
             )
             
             if result.returncode == 0:
                 print("✓ 默认依赖安装成功")
                 return True
             else:
-                print(f"❌ 从 {mirror} 安装失败: {result.stderr}")
+                print(f"❌ 从镜像源安装失败: {result.stderr}")
         except Exception as e:
             print(f"❌ 安装出错: {e}")
     
@@ -188,10 +499,13 @@ def install_default_dependencies():
     try:
         print("尝试使用默认源安装...")
         result = subprocess.run(
-            [sys.executable, "-m", "pip", "install"] + default_dependencies,
+            PIP_COMMAND + ["install"] + default_dependencies
+            + get_parallel_download_args(),
             capture_output=True,
             text=True,
-            timeout=300
+            timeout=300,
+            env=PIP_ENV,
+            **SUBPROCESS_KWARGS
         )
         
         if result.returncode == 0:
@@ -217,18 +531,21 @@ def install_missing_packages():
         'PIL': 'pillow'
     }
     
-    missing_packages = []
-    
-    for package, pip_name in required_packages.items():
-        try:
-            if package == 'PIL':
-                __import__('PIL')
+    # 只查找模块位置，不真正导入（避免加载PyQt5等大型扩展），各包并发查找
+    installed = {}
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = {executor.submit(importlib.util.find_spec, package): package
+                   for package in required_packages}
+        for future in as_completed(futures):
+            package = futures[future]
+            installed[package] = future.result() is not None
+            if installed[package]:
+                locked_print(f"✓ {package} 已安装")
             else:
-                __import__(package)
-            print(f"✓ {package} 已安装")
-        except ImportError:
-            print(f"❌ {package} 未安装")
-            missing_packages.append(pip_name)
+                locked_print(f"❌ {package} 未安装")
+    
+    missing_packages = [pip_name for package, pip_name in required_packages.items()
+                        if not installed[package]]
     
     if missing_packages:
         print(f"\n正在安装缺失的包: {', '.join(missing_packages)}")
@@ -236,28 +553,31 @@ def install_missing_packages():
         # 使用国内镜像源
         mirrors = [
             "https://pypi.tuna.tsinghua.edu.cn/simple/",
-            "https://mirrors.aliyun.com/pypi/simple/",
-            "https://pypi.douban.com/simple/"
+            "https://mirrors.aliyun.com/pypi/simple/"
         ]
+        _, reachable = rank_mirrors(mirrors)
         
+        # 只把探测可用的镜像交给pip，不可达的索引会拖慢每个包的查询
         success = False
-        for mirror in mirrors:
+        if reachable:
             try:
-                print(f"尝试从 {mirror} 安装...")
+                print(f"尝试从镜像源安装（主索引: {reachable[0]}）...")
                 result = subprocess.run(
-                    [sys.executable, "-m", "pip", "install"] + missing_packages + 
-                    ["-i", mirror, "--trusted-host", mirror.split("//")[1].split("/")[0]],
+                    PIP_COMMAND + ["install"] + missing_packages
+                    + mirror_index_args(reachable)
+                    + get_parallel_download_args(),
                     capture_output=True,
                     text=True,
-                    timeout=300
+                    timeout=300,
+                    env=PIP_ENV,
+                    **SUBPROCESS_KWARGS
                 )
                 
                 if result.returncode == 0:
                     print("✓ 缺失包安装成功")
                     success = True
-                    break
                 else:
-                    print(f"❌ 从 {mirror} 安装失败: {result.stderr}")
+                    print(f"❌ 从镜像源安装失败: {result.stderr}")
             except Exception as e:
                 print(f"❌ 安装出错: {e}")
         
@@ -265,10 +585,13 @@ def install_missing_packages():
             print("❌ 尝试使用默认源安装...")
             try:
                 result = subprocess.run(
-                    [sys.executable, "-m", "pip", "install"] + missing_packages,
+                    PIP_COMMAND + ["install"] + missing_packages
+                    + get_parallel_download_args(),
                     capture_output=True,
                     text=True,
-                    timeout=300
+                    timeout=300,
+                    env=PIP_ENV,
+                    **SUBPROCESS_KWARGS
                 )
                 
                 if result.returncode == 0:
@@ -285,98 +608,146 @@ def install_missing_packages():
     
     return True
 
-def create_icon():
-    """创建程序图标（如果不存在）"""
+def create_icon(log=print):
+    """创建程序图标（如果不存在），输出信息交给log（默认直接打印）"""
     base_dir = get_base_dir()
     icon_file = os.path.join(base_dir, "icon.ico")
     
-    if not os.path.exists(icon_file):
-        print("\n创建默认图标...")
+    if not cached_exists(icon_file):
+        log("\n创建默认图标...")
         try:
-            # 创建一个简单的图标文件（实际项目中应该提供真正的图标）
-            from PIL import Image, ImageDraw
-            
-            # 创建32x32图标
-            img = Image.new('RGBA', (32, 32), (24, 144, 255, 255))
-            draw = ImageDraw.Draw(img)
-            draw.rectangle([8, 8, 24, 24], fill=(255, 255, 255, 255))
-            
-            # 保存为ICO格式
-            img.save(icon_file, format='ICO', sizes=[(32, 32)])
-            print(f"✓ 已创建默认图标: {icon_file}")
-        except ImportError:
-            print("⚠  无法创建图标（PIL未安装），使用默认图标")
-            # 如果没有PIL，创建一个空的ICO文件占位
             with open(icon_file, 'wb') as f:
-                f.write(b'')  # 空文件，编译时会忽略
+                f.write(base64.b64decode(_DEFAULT_ICON_B64))
+            invalidate_stat_cache(icon_file)
+            log(f"✓ 已创建默认图标: {icon_file}")
+        except OSError as e:
+            log(f"⚠  创建图标失败: {e}")
     else:
-        print(f"✓ 使用现有图标: {icon_file}")
+        log(f"✓ 使用现有图标: {icon_file}")
     
     return icon_file
 
-def create_config_files():
-    """创建必要的配置文件"""
+# 默认配置文件内容
+DEFAULT_CONFIG_INI = (
+    b"[Settings]\n"
+    b"save_path=screenshots\n"
+    b"capture_interval=60\n"
+    b"buffer_size=100\n"
+    b"foreground_detection=true\n"
+    b"ink_detection=true\n"
+    b"auto_start=false\n"
+    b"silent_start=false\n"
+    b"minimize_to_tray=true\n"
+)
+
+def create_config_files(log=print):
+    """创建必要的配置文件，输出信息交给log（默认直接打印）"""
     base_dir = get_base_dir()
     
-    # 创建config.ini如果不存在
+    # 创建config.ini如果不存在（O_EXCL独占创建省去先检查，整个文件一次写入）
     config_file = os.path.join(base_dir, "config.ini")
-    if not os.path.exists(config_file):
-        print("\n创建默认配置文件...")
+    try:
+        fd = os.open(config_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        log("\n创建默认配置文件...")
         try:
-            with open(config_file, 'w', encoding='utf-8') as f:
-                f.write("[Settings]\n")
-                f.write("save_path=screenshots\n")
-                f.write("capture_interval=60\n")
-                f.write("buffer_size=100\n")
-                f.write("foreground_detection=true\n")
-                f.write("ink_detection=true\n")
-                f.write("auto_start=false\n")
-                f.write("silent_start=false\n")
-                f.write("minimize_to_tray=true\n")
-            print(f"✓ 已创建配置文件: {config_file}")
-        except Exception as e:
-            print(f"⚠  创建配置文件失败: {e}")
-    else:
-        print(f"✓ 配置文件已存在: {config_file}")
+            os.write(fd, DEFAULT_CONFIG_INI)
+        finally:
+            os.close(fd)
+        invalidate_stat_cache(config_file)
+        log(f"✓ 已创建配置文件: {config_file}")
+    except FileExistsError:
+        log(f"✓ 配置文件已存在: {config_file}")
+    except Exception as e:
+        log(f"⚠  创建配置文件失败: {e}")
     
     # 创建screenshots目录
     screenshots_dir = os.path.join(base_dir, "screenshots")
-    if not os.path.exists(screenshots_dir):
-        print("\n创建截图目录...")
-        try:
-            os.makedirs(screenshots_dir, exist_ok=True)
-            print(f"✓ 已创建截图目录: {screenshots_dir}")
-        except Exception as e:
-            print(f"⚠  创建截图目录失败: {e}")
-    else:
-        print(f"✓ 截图目录已存在: {screenshots_dir}")
+    try:
+        os.mkdir(screenshots_dir)
+        invalidate_stat_cache(screenshots_dir)
+        log(f"✓ 已创建截图目录: {screenshots_dir}")
+    except FileExistsError:
+        log(f"✓ 截图目录已存在: {screenshots_dir}")
+    except Exception as e:
+        log(f"⚠  创建截图目录失败: {e}")
     
     return config_file, screenshots_dir
 
-def compile_exe():
-    """编译可执行文件"""
+def precompile_sources(base_dir):
+    """编译前用多进程compileall预先生成项目和PyQt5的.pyc"""
+    targets = [base_dir]
+    spec = importlib.util.find_spec('PyQt5')
+    if spec is not None and spec.submodule_search_locations:
+        targets.extend(spec.submodule_search_locations)
+    
+    print("预编译Python源文件...")
+    try:
+        result = subprocess.run(
+            [sys.executable, "-m", "compileall", "-j", "0", "-q",
+             # 跳过pip缓存、wheel仓库和版本库目录
+             "-x", r"[\\/]\.(pip-cache|wheels|git)([\\/]|$)"] + targets,
+            capture_output=True,
+            text=True,
+            timeout=300,
+            **SUBPROCESS_KWARGS
+        )
+        if result.returncode == 0:
+            print("✓ 预编译完成")
+        else:
+            print(f"⚠  预编译部分失败，继续编译: {result.stdout}{result.stderr}")
+    except Exception as e:
+        print(f"⚠  预编译出错，继续编译: {e}")
+
+# 程序用不到的标准库与PyQt5模块，排除后可缩小分析范围和exe体积
+EXCLUDED_MODULES = [
+    'tkinter',
+    'unittest',
+    'test',
+    'xmlrpc',
+    'pydoc_data',
+    'PyQt5.QtBluetooth',
+    'PyQt5.QtMultimedia',
+    'PyQt5.QtMultimediaWidgets',
+    'PyQt5.QtWebEngineWidgets',
+    'PyQt5.QtWebEngineCore',
+    'PyQt5.QtQuick',
+    'PyQt5.QtQml',
+    'PyQt5.Qt3DCore',
+]
+
+def compile_exe(icon_file=None, config_files=None):
+    """编译可执行文件
+
+    icon_file / config_files 为预先创建好的结果，未提供时在此处创建
+    """
     print("\n" + "=" * 60)
     print("开始编译可执行文件...")
     print("=" * 60)
     
     base_dir = get_base_dir()
+    # 一次枚举基础目录，后续对main.py、icon.ico、config.ini等的检查都命中缓存
+    entries = scan_directory(base_dir)
     
     # 清理之前的编译结果
     build_dirs = ['build', 'dist']
     for dir_name in build_dirs:
-        dir_path = os.path.join(base_dir, dir_name)
-        if os.path.exists(dir_path):
-            shutil.rmtree(dir_path)
-            print(f"✓ 清理目录: {dir_path}")
+        entry = entries.get(dir_name)
+        if entry is not None and entry.is_dir():
+            shutil.rmtree(entry.path)
+            invalidate_stat_cache(entry.path)
+            print(f"✓ 清理目录: {entry.path}")
     
     # 编译命令参数
     main_script = os.path.join(base_dir, "main.py")
     app_name = "SmartBoardMonitor"
-    icon_file = create_icon()
-    config_file, screenshots_dir = create_config_files()
+    if icon_file is None:
+        icon_file = create_icon()
+    if config_files is None:
+        config_files = create_config_files()
+    config_file, screenshots_dir = config_files
     
     # 检查主脚本是否存在
-    if not os.path.exists(main_script):
+    if not cached_exists(main_script):
         print(f"❌❌ 找不到主脚本文件: {main_script}")
         print("请确保main.py文件存在")
         return False
@@ -387,6 +758,11 @@ def compile_exe():
     original_cwd = os.getcwd()
     os.chdir(base_dir)
     
+    # PyInstaller的中间文件和输出放在临时目录，大量临时写入不落在源码盘上，
+    # 结束后只需删除这一个目录
+    workpath = tempfile.mkdtemp(prefix='pyi_work_')
+    distpath = os.path.join(workpath, 'dist')
+    
     try:
         pyinstaller_cmd = [
             'pyinstaller',
@@ -395,39 +771,74 @@ def compile_exe():
             '--name', app_name,
             '--add-data', 'icon.ico;.',
             '--add-data', 'config.ini;.',
-            '--add-data', 'screenshots;screenshots',
+            # screenshots目录由程序运行时自动创建，不打包进exe
             '--hidden-import', 'PyQt5.sip',
             '--hidden-import', 'PyQt5.QtCore',
             '--hidden-import', 'PyQt5.QtGui',
             '--hidden-import', 'PyQt5.QtWidgets',
+            '--workpath', workpath,
+            '--distpath', distpath,
             '--clean',
             '--noconfirm'
         ]
         
-        if os.path.exists(icon_file):
+        for module in EXCLUDED_MODULES:
+            pyinstaller_cmd.extend(['--exclude-module', module])
+        
+        if cached_exists(icon_file):
             pyinstaller_cmd.extend(['--icon', icon_file])
         
         pyinstaller_cmd.append('main.py')
         
+        precompile_sources(base_dir)
+        
         print("执行编译命令...")
         print(f"命令: {' '.join(pyinstaller_cmd)}")
         
-        result = subprocess.run(
+        # 逐行转发编译输出，只保留最后200行用于失败时的错误报告
+        proc = subprocess.Popen(
             pyinstaller_cmd,
-            capture_output=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
             text=True,
-            timeout=600  # 10分钟超时
+            bufsize=1,
+            **SUBPROCESS_KWARGS
         )
+        tail_lines = deque(maxlen=200)
+        timed_out = threading.Event()
         
-        if result.returncode == 0:
+        def kill_on_timeout():
+            timed_out.set()
+            proc.kill()
+        
+        timer = threading.Timer(600, kill_on_timeout)  # 10分钟超时
+        timer.start()
+        try:
+            for line in proc.stdout:
+                print(line, end='')
+                tail_lines.append(line)
+            returncode = proc.wait()
+        finally:
+            timer.cancel()
+            proc.stdout.close()
+        
+        if timed_out.is_set():
+            raise subprocess.TimeoutExpired(pyinstaller_cmd, 600)
+        
+        if returncode == 0:
             print("✓ 编译成功")
             
             # 复制生成的可执行文件到项目根目录
-            exe_path = os.path.join('dist', f'{app_name}.exe')
+            exe_path = os.path.join(distpath, f'{app_name}.exe')
             if os.path.exists(exe_path):
                 target_path = os.path.join(base_dir, f'{app_name}.exe')
-                shutil.copy(exe_path, target_path)
-                print(f"✓ 已复制可执行文件到: {target_path}")
+                # 同一卷上直接重命名，避免整文件复制；跨卷时退回复制
+                try:
+                    os.replace(exe_path, target_path)
+                except OSError:
+                    shutil.copy2(exe_path, target_path)
+                invalidate_stat_cache(target_path)
+                print(f"✓ 已移动可执行文件到: {target_path}")
                 
                 # 显示文件大小
                 file_size = os.path.getsize(target_path) / (1024 * 1024)
@@ -435,11 +846,8 @@ def compile_exe():
             
             return True
         else:
-            print("❌❌ 编译失败:")
-            print("标准输出:")
-            print(result.stdout)
-            print("错误输出:")
-            print(result.stderr)
+            print("❌❌ 编译失败，最后的输出:")
+            print(''.join(tail_lines))
             return False
             
     except subprocess.TimeoutExpired:
@@ -449,26 +857,44 @@ def compile_exe():
         print(f"❌❌ 编译出错: {e}")
         return False
     finally:
-        # 恢复原始工作目录
+        # 恢复原始工作目录，并删除临时编译目录
         os.chdir(original_cwd)
+        shutil.rmtree(workpath, ignore_errors=True)
 
 def main():
     """主函数"""
+    _stat_cache.clear()
+    _scanned_dirs.clear()
+    
     # 检查环境
     if not check_environment():
         return
     
-    # 安装依赖
-    if not install_dependencies():
-        print("\n尝试继续编译，但依赖可能不完整...")
-        # 继续尝试，但警告用户
+    # 图标和配置文件与依赖安装互不相关，在后台线程中与pip的网络等待重叠进行。
+    # 后台线程的输出先收集起来，等依赖安装输出结束后再统一打印，避免互相穿插
+    icon_messages = []
+    config_messages = []
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        icon_future = executor.submit(create_icon, icon_messages.append)
+        config_future = executor.submit(create_config_files, config_messages.append)
+        
+        # 安装依赖
+        if not install_dependencies():
+            print("\n尝试继续编译，但依赖可能不完整...")
+            # 继续尝试，但警告用户
+        
+        # 检查并安装缺失包
+        if not install_missing_packages():
+            print("\n警告：部分依赖包可能未正确安装")
+        
+        icon_file = icon_future.result()
+        config_files = config_future.result()
     
-    # 检查并安装缺失包
-    if not install_missing_packages():
-        print("\n警告：部分依赖包可能未正确安装")
+    for message in icon_messages + config_messages:
+        print(message)
     
     # 编译可执行文件
-    if not compile_exe():
+    if not compile_exe(icon_file, config_files):
         return
     
     print("\n" + "=" * 60)
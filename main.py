@@ -10,24 +10,47 @@ import sys
 import os
 import time
 import json
+import bisect
+import threading
+import queue
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from PyQt5.QtWidgets import QApplication, QMessageBox, QSystemTrayIcon
-from PyQt5.QtCore import QTimer, QThread, pyqtSignal, QMutex
+from PyQt5.QtCore import Qt, QObject, QTimer, QThread, pyqtSignal
 from PyQt5.QtGui import QFont
 
+# orjson为可选依赖，未安装时使用标准库json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # 导入自定义模块
 from modules.gui import SmartBoardGUI
 from modules.detector import InputDetector, WindowsInkDetector
-from modules.screenshot import ScreenshotManager
+from modules.screenshot import ScreenshotManager, FrameBufferPool, normalize_process_names
 from modules.buffer import BufferManager
 from modules.config import ConfigManager
 from modules.tray import SystemTrayManager
 from modules.logger import LogManager
 
+def _fmt_hm(dt):
+    """格式化为 HH:MM（比strftime开销小）"""
+    return f"{dt.hour:02d}:{dt.minute:02d}"
+
+def _fmt_hms(dt):
+    """格式化为 HH:MM:SS（比strftime开销小）"""
+    return f"{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}"
+
+@lru_cache(maxsize=64)
+def parse_process_names(process_text):
+    """解析逗号分隔的进程名，结果缓存（进程名设置很少变化）"""
+    return tuple(name.strip() for name in process_text.split(',') if name.strip())
+
 class MonitorThread(QThread):
     """监控线程，负责定时截图"""
     
-    capture_signal = pyqtSignal(object)  # 截图数据信号
     status_signal = pyqtSignal(str, str)  # 状态更新信号（类型，消息）
     log_signal = pyqtSignal(str, str)  # 日志信号（级别，消息）
     
@@ -39,24 +62,39 @@ class MonitorThread(QThread):
         self.input_detector = None
         self.ink_detector = None
         self.screenshot_manager = None
+        self.frame_pool = None
+        self.capture_queue = None  # 截图槽位队列，由主线程定时取出处理
         self.foreground_detection = True
-        self.process_names = []
+        self.process_names = ()
+        self.target_names = frozenset()  # 规范化后的目标进程名（小写，带.exe后缀）
         self.ink_enabled = True
-        self.last_activity_time = time.time()
-        self.mutex = QMutex()
+        self.last_activity_time = time.monotonic()
         self.current_monitor_target = "整个显示器"
         
+        # 停止时用于立即唤醒等待中的线程
+        self._wake = threading.Event()
+        
         # 标志位，用于控制是否进行截图
         self.capture_enabled = False
+        self._capture_enabled_evt = threading.Event()
     
     def enable_capture(self, enable=True):
         """启用/禁用截图功能"""
         self.capture_enabled = enable
+        if enable:
+            self._capture_enabled_evt.set()
+        else:
+            self._capture_enabled_evt.clear()
     
     def set_monitor_target(self, target):
         """设置监控目标"""
         self.current_monitor_target = target
     
+    def set_process_names(self, process_names):
+        """设置监控进程名，并预先生成截图时用于匹配的规范化进程名集合"""
+        self.process_names = process_names
+        self.target_names = normalize_process_names(process_names)
+    
     def run(self):
         """线程主循环 - 固定间隔截图，不检测活动"""
         self.is_running = True
@@ -65,58 +103,112 @@ class MonitorThread(QThread):
         self.status_signal.emit("info", "监控线程启动(固定间隔模式)")
         
         while not self.stop_flag:
-            try:
-                # 只有在启用截图时才执行截图逻辑
-                if not self.capture_enabled:
-                    self.msleep(100)  # 短暂休眠避免占用CPU
-                    continue
-                
-                # 固定间隔截图，不检测活动
-                self.last_activity_time = time.time()
-                
-                # 执行截图
-                pixmap = None
-                if self.screenshot_manager:
-                    if self.foreground_detection and self.process_names:
-                        pixmap = self.screenshot_manager.capture_foreground_window(self.process_names)
+            # 只有在启用截图时才执行截图逻辑，未启用时阻塞等待而不是轮询
+            if not self._capture_enabled_evt.is_set():
+                self._capture_enabled_evt.wait(0.5)
+                continue
+            
+            # 固定间隔截图，不检测活动
+            self.last_activity_time = time.monotonic()
+            
+            # 执行截图，写入从帧缓冲池借出的槽位
+            if self.screenshot_manager and self.frame_pool:
+                slot = self.frame_pool.acquire(1000)
+                if slot is None:
+                    self.log_signal.emit("WARNING", "帧缓冲池已满，跳过本次截图")
+                else:
+                    try:
+                        target_names = self.target_names
+                        if self.foreground_detection and target_names:
+                            image = self.screenshot_manager.capture_foreground_window(
+                                target_names, self.frame_pool, slot)
+                        else:
+                            image = self.screenshot_manager.capture_screen(self.frame_pool, slot)
+                    except Exception as e:
+                        image = None
+                        self.report_error(e)
+                    
+                    if image is not None:
+                        # 放入队列，由主线程的handle_capture处理后归还槽位
+                        self.capture_queue.put(slot)
+                        self.log_signal.emit("INFO", f"固定间隔截图成功")
                     else:
-                        pixmap = self.screenshot_manager.capture_screen()
-                
-                if pixmap:
-                    # 发射信号传递截图数据
-                    self.capture_signal.emit(pixmap)
-                    self.log_signal.emit("INFO", f"固定间隔截图成功")
+                        self.frame_pool.release(slot)
+            
+            # 检查停止标志
+            if self.stop_flag:
+                break
                 
-                # 检查停止标志
-                if self.stop_flag:
-                    break
-                    
-                # 等待指定的间隔时间
-                for i in range(int(self.interval * 10)):  # 每0.1秒检查一次停止标志
-                    if self.stop_flag:
-                        break
-                    self.msleep(100)
-                    
-            except Exception as e:
-                error_msg = f"监控线程错误: {str(e)}"
-                self.log_signal.emit("ERROR", error_msg)
-                self.status_signal.emit("error", error_msg)
-                self.msleep(1000)  # 出错时等待1秒
+            # 等待指定的间隔时间，stop()会立即唤醒
+            if self._wake.wait(self.interval):
+                break
         
         self.is_running = False
         self.log_signal.emit("INFO", "监控线程已停止")
         self.status_signal.emit("info", "监控线程已停止")
     
+    def report_error(self, e):
+        """报告截图错误，并等待1秒后再继续"""
+        error_msg = f"监控线程错误: {str(e)}"
+        self.log_signal.emit("ERROR", error_msg)
+        self.status_signal.emit("error", error_msg)
+        self._wake.wait(1.0)  # 出错时等待1秒
+    
     def stop(self):
         """停止监控线程"""
-        self.mutex.lock()
         self.stop_flag = True
-        self.mutex.unlock()
+        self._wake.set()
         
         # 等待线程结束，但设置超时
         if self.isRunning():
             self.wait(2000)  # 最多等待2秒
 
+class _NullWidget:
+    """界面创建前代替控件和界面方法，忽略所有属性访问和调用"""
+    
+    def __getattr__(self, name):
+        return self
+    
+    def __call__(self, *args, **kwargs):
+        return None
+
+
+_NULL_WIDGET = _NullWidget()
+
+
+class _LazyGuiProxy(QObject):
+    """静默启动时代替主窗口的占位对象
+    
+    提供与SmartBoardGUI相同的信号，设置直接从配置读取，其余界面操作全部忽略，
+    直到首次显示窗口时才创建真正的界面。
+    """
+    
+    start_monitor_signal = pyqtSignal()
+    stop_monitor_signal = pyqtSignal()
+    auto_start_changed = pyqtSignal(bool, bool)
+    update_volume_estimate = pyqtSignal()
+    process_changed = pyqtSignal(str)
+    settings_changed = pyqtSignal(dict)
+    
+    SETTING_KEYS = ('save_path', 'capture_interval', 'buffer_size', 'save_times',
+                    'foreground_detection', 'process_names', 'ink_detection',
+                    'auto_start', 'silent_start', 'minimize_to_tray',
+                    'image_format', 'image_quality')
+    
+    def __init__(self, config):
+        super().__init__()
+        self.config = config
+    
+    def get_settings(self):
+        """从配置中获取设置"""
+        settings = {key: self.config.get(key) for key in self.SETTING_KEYS}
+        settings['save_times'] = list(settings['save_times'] or [])
+        return settings
+    
+    def __getattr__(self, name):
+        return _NULL_WIDGET
+
+
 class SmartBoardApp:
     """智能板书应用主类"""
     
@@ -133,6 +225,9 @@ class SmartBoardApp:
         # 初始化日志管理器
         self.log_manager = LogManager()
         
+        # 最近一条信息类状态消息（时间，内容），用于去除短时间内的重复消息
+        self._last_info = (0.0, None)
+        
         # 初始化配置管理器
         self.config_manager = ConfigManager()
         self.config = self.config_manager.load_config()
@@ -141,14 +236,17 @@ class SmartBoardApp:
         self.process_history = self.load_process_history()
         
         # 初始化截图管理器
-        self.screenshot_manager = ScreenshotManager()
-        
-        # 初始化UI
-        self.gui = SmartBoardGUI(self.log_manager, self.process_history)
-        self.gui.config = self.config
+        self.screenshot_manager = ScreenshotManager(self.log_manager)
+        self.screenshot_manager.set_image_format(self.config.get('image_format', 'jpg'))
+        self.screenshot_manager.set_image_quality(self.config.get('image_quality', 85))
         
-        # 加载设置到GUI
-        self.gui.load_settings(self.config)
+        # 初始化UI（静默启动时先使用占位对象，首次显示窗口时再创建界面）
+        self.lazy_gui = silent_start or (self.config.get('auto_start', False)
+                                         and self.config.get('silent_start', False))
+        if self.lazy_gui:
+            self.gui = _LazyGuiProxy(self.config)
+        else:
+            self.gui = self.create_gui()
         
         # 初始化后端模块
         self.input_detector = InputDetector()
@@ -158,6 +256,19 @@ class SmartBoardApp:
         # 监控线程
         self.monitor_thread = None
         
+        # 停止监控时保存剩余截图的后台线程
+        self.final_save_thread = None
+        
+        # 截图帧缓冲池（首次开始监控时按缓冲区大小创建）
+        self.frame_pool = None
+        
+        # 监控线程产生的截图直接入队，不经过Qt信号的跨线程投递
+        self.capture_queue = queue.SimpleQueue()
+        
+        # 截图编码在后台线程中进行，编码完成的future放入结果队列，由主线程取出
+        self.encoder_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="enc")
+        self.encoded_queue = queue.SimpleQueue()
+        
         # 统计信息
         self.capture_count = 0
         self.last_capture_time = None
@@ -165,9 +276,19 @@ class SmartBoardApp:
         self.is_monitoring = False
         self.current_processes = []
         
+        # 上次显示的缓冲区状态，用于跳过重复的界面刷新
+        self._last_buf = (-1, -1)
+        self._last_estimated_mb = None
+        
+        # 排序后的保存时间点缓存，设置变更时更新
+        self._sorted_save_times = []
+        self._save_time_set = set()
+        self.update_save_times_cache(self.config.get('save_times', []))
+        
         # 定时器
         self.status_timer = QTimer()
-        self.save_check_timer = QTimer()
+        self.capture_drain_timer = QTimer()
+        self._tick = 0  # 状态定时器计数，用于按倍数执行空闲检测和保存检查
         
         # 系统托盘
         self.tray_manager = SystemTrayManager(self.gui, self)
@@ -220,6 +341,52 @@ class SmartBoardApp:
             else:
                 self.gui.show()
     
+    def create_gui(self):
+        """创建主窗口并加载设置"""
+        gui = SmartBoardGUI(self.log_manager, self.process_history)
+        gui.config = self.config
+        gui.load_settings(self.config)
+        return gui
+    
+    @property
+    def gui_ready(self):
+        """主窗口是否已创建"""
+        return isinstance(self.gui, SmartBoardGUI)
+    
+    def _ensure_gui(self):
+        """确保主窗口已创建，首次创建时连接信号并同步当前状态"""
+        if self.gui_ready:
+            return self.gui
+        
+        self.gui = self.create_gui()
+        self.connect_gui_signals()
+        
+        # 同步统计信息
+        self.gui.update_capture_count(self.capture_count)
+        if self.last_capture_time:
+            self.gui.update_last_capture(_fmt_hms(self.last_capture_time))
+        self._last_buf = (-1, -1)
+        self._last_estimated_mb = None
+        buffer_info = self.buffer_manager.get_buffer_info()
+        self.on_buffer_updated(buffer_info['current_size'], buffer_info['max_size'])
+        self.update_volume_estimate()
+        self.calculate_next_save_time()
+        
+        # 同步监控状态
+        if self.is_monitoring:
+            self.gui.is_monitoring = True
+            self.gui.start_btn.setEnabled(False)
+            self.gui.stop_btn.setEnabled(True)
+            self.gui.status_label.setText("运行中")
+            self.gui.set_status_running(True)
+            process_names = self.monitor_thread.process_names if self.monitor_thread else ()
+            if process_names:
+                self.gui.system_info_label.setText(f"正在监控: {', '.join(process_names)}")
+            else:
+                self.gui.system_info_label.setText("正在监控: 整个显示器")
+        
+        return self.gui
+    
     def load_process_history(self):
         """加载进程历史记录"""
         history = []
@@ -229,16 +396,20 @@ class SmartBoardApp:
             history_file = os.path.join(base_dir, "process_history.json")
             
             if os.path.exists(history_file):
-                with open(history_file, 'r', encoding='utf-8') as f:
-                    history = json.load(f)
+                with open(history_file, 'rb') as f:
+                    raw = f.read()
+                history = orjson.loads(raw) if orjson else json.loads(raw.decode('utf-8'))
                 print(f"✓ 已加载进程历史记录: {len(history)} 条")
                 if hasattr(self, 'log_manager') and self.log_manager:
                     self.log_manager.add_log("INFO", f"已加载进程历史记录: {len(history)} 条")
             else:
                 print("ℹ 未找到进程历史记录文件，将创建新文件")
                 # 创建空的JSON文件
-                with open(history_file, 'w', encoding='utf-8') as f:
-                    json.dump([], f, ensure_ascii=False, indent=2)
+                with open(history_file, 'wb') as f:
+                    if orjson:
+                        f.write(orjson.dumps([], option=orjson.OPT_INDENT_2))
+                    else:
+                        f.write(json.dumps([], ensure_ascii=False, indent=2).encode('utf-8'))
         except Exception as e:
             print(f"✗ 加载进程历史记录失败: {e}")
             if hasattr(self, 'log_manager') and self.log_manager:
@@ -259,36 +430,55 @@ class SmartBoardApp:
                 self.log_manager.add_log("ERROR", error_msg)
     
     def update_status_message(self, msg_type, message):
-        """更新状态消息"""
+        """更新状态消息（200毫秒内重复的信息类消息直接忽略）"""
         if msg_type == "error":
-            print(f"错误: {message}")
+            if __debug__:
+                print(f"错误: {message}")
             self.log_manager.add_log("ERROR", message)
         elif msg_type == "info":
-            print(f"信息: {message}")
+            now = time.monotonic()
+            last_time, last_message = self._last_info
+            if message == last_message and now - last_time < 0.2:
+                return
+            self._last_info = (now, message)
+            if __debug__:
+                print(f"信息: {message}")
             self.log_manager.add_log("INFO", message)
         
-        # 更新系统信息标签
-        self.gui.system_info_label.setText(message[:50])  # 限制长度
+        # 更新系统信息标签，文本未变化时不重复设置
+        text = message[:50]  # 限制长度
+        if self.gui.system_info_label.text() != text:
+            self.gui.system_info_label.setText(text)
     
     def connect_signals(self):
         """连接所有信号"""
         # GUI信号
+        self.connect_gui_signals()
+        
+        # 缓冲区管理器信号
+        # 保存线程也会发射buffer_updated，显式排队到主线程处理
+        self.buffer_manager.buffer_updated.connect(self.on_buffer_updated, Qt.QueuedConnection)
+        self.buffer_manager.buffer_full_signal.connect(self.on_buffer_full)
+    
+    def connect_gui_signals(self):
+        """连接主窗口（或静默启动时的占位对象）的信号"""
         self.gui.start_monitor_signal.connect(self.start_monitoring)
         self.gui.stop_monitor_signal.connect(self.stop_monitoring)
         self.gui.auto_start_changed.connect(self.on_auto_start_changed)
         self.gui.update_volume_estimate.connect(self.update_volume_estimate)
         self.gui.process_changed.connect(self.on_process_changed)
         self.gui.settings_changed.connect(self.on_settings_changed)  # 新增
-        
-        # 缓冲区管理器信号
-        self.buffer_manager.buffer_updated.connect(self.on_buffer_updated)
-        self.buffer_manager.buffer_full_signal.connect(self.on_buffer_full)
+    
+    def update_save_times_cache(self, save_times):
+        """更新保存时间点缓存"""
+        self._sorted_save_times = sorted(save_times)
+        self._save_time_set = set(save_times)
     
     def on_process_changed(self, process_text):
         """处理进程设置改变"""
         process_text = process_text.strip()
         if process_text:
-            process_names = [name.strip() for name in process_text.split(',') if name.strip()]
+            process_names = parse_process_names(process_text)
             self.current_processes = process_names
             
             # 更新监控目标显示
@@ -323,18 +513,13 @@ class SmartBoardApp:
     
     def setup_timers(self):
         """设置定时器"""
-        # 状态更新定时器
+        # 状态更新定时器，同时负责空闲检测（每5秒）和保存时间检查（每30秒）
         self.status_timer.timeout.connect(self.update_gui_status)
         self.status_timer.start(1000)  # 每秒更新一次
         
-        # 保存时间检查定时器
-        self.save_check_timer.timeout.connect(self.check_save_times)
-        self.save_check_timer.start(30000)  # 每30秒检查一次
-        
-        # 空闲检测定时器
-        self.idle_timer = QTimer()
-        self.idle_timer.timeout.connect(self.check_idle_time)
-        self.idle_timer.start(5000)  # 每5秒检查一次
+        # 截图队列处理定时器（只在监控期间运行）
+        self.capture_drain_timer.timeout.connect(self.drain_capture_queue)
+        self.capture_drain_timer.setInterval(200)
     
     def load_settings_to_gui(self):
         """将配置加载到GUI"""
@@ -349,11 +534,15 @@ class SmartBoardApp:
         if 'buffer_size' in self.config:
             self.gui.buffer_size_spin.setValue(int(self.config['buffer_size']))
         
+        # 设置图片格式
+        if 'image_format' in self.config:
+            self.gui.set_image_format(self.config['image_format'])
+        if 'image_quality' in self.config:
+            self.gui.quality_spin.setValue(int(self.config['image_quality']))
+        
         # 设置时间点
         if 'save_times' in self.config:
-            self.gui.time_list.clear()
-            for time_str in self.config['save_times']:
-                self.gui.time_list.addItem(time_str)
+            self.gui.set_save_times(self.config['save_times'])
         
         # 设置高级选项
         if 'foreground_detection' in self.config:
@@ -383,7 +572,8 @@ class SmartBoardApp:
             
             # 更新配置并立即保存
             self.config.update(settings)
-            self.config_manager.save_config(self.config)  # 立即保存到磁盘
+            self.config_manager.save_config(self.config)  # 保存配置（稍后写盘）
+            self.update_save_times_cache(settings['save_times'])
             
             # 启动输入检测
             self.input_detector.start_detection()
@@ -402,25 +592,33 @@ class SmartBoardApp:
             # 设置缓冲区大小
             self.buffer_manager.set_buffer_size(settings['buffer_size'])
             
+            # 设置近似重复检测
+            self.buffer_manager.set_near_duplicate_distance(self.config.get('near_duplicate_distance', 0))
+            
+            # 帧缓冲池在整个程序生命周期内复用，停止后仍在排队的截图也能正确归还槽位
+            if self.frame_pool is None:
+                self.frame_pool = FrameBufferPool(max(3, settings['buffer_size'] // 8))
+            
+            # 重新开始监控时第一张截图总是保存
+            self.screenshot_manager.reset_frame_history()
+            
             # 创建并启动监控线程
             self.monitor_thread = MonitorThread()
             self.monitor_thread.input_detector = self.input_detector
             self.monitor_thread.ink_detector = self.ink_detector
             self.monitor_thread.screenshot_manager = self.screenshot_manager
+            self.monitor_thread.frame_pool = self.frame_pool
+            self.monitor_thread.capture_queue = self.capture_queue
             self.monitor_thread.foreground_detection = settings['foreground_detection']
             self.monitor_thread.ink_enabled = settings['ink_detection']
             self.monitor_thread.interval = settings['capture_interval']
             
             # 处理进程名
-            if settings['process_names']:
-                self.monitor_thread.process_names = [
-                    name.strip() for name in settings['process_names'].split(',')
-                    if name.strip()
-                ]
+            process_names = parse_process_names(settings['process_names'])
+            self.monitor_thread.set_process_names(process_names)
             
             # 设置监控目标
             if settings['process_names'] and settings['foreground_detection']:
-                process_names = [name.strip() for name in settings['process_names'].split(',') if name.strip()]
                 if len(process_names) == 1:
                     self.monitor_thread.set_monitor_target(f"进程: {process_names[0]}")
                 else:
@@ -429,18 +627,13 @@ class SmartBoardApp:
                 self.monitor_thread.set_monitor_target("整个显示器")
             
             # 连接监控线程信号
-            self.monitor_thread.capture_signal.connect(self.handle_capture)
-            self.monitor_thread.status_signal.connect(self.update_status_message)
-            self.monitor_thread.log_signal.connect(self.log_manager.add_log)
+            self.monitor_thread.status_signal.connect(self.update_status_message, Qt.QueuedConnection)
+            self.monitor_thread.log_signal.connect(self.log_manager.add_log, Qt.QueuedConnection)
             
-            # 启动线程，但先不启用截图
+            # 线程启动完成后再启用截图功能（不在GUI线程中等待）
+            self.monitor_thread.started.connect(self.monitor_thread.enable_capture)
             self.monitor_thread.start()
-            
-            # 等待线程启动完成
-            time.sleep(0.1)
-            
-            # 现在启用截图功能
-            self.monitor_thread.enable_capture(True)
+            self.capture_drain_timer.start()
             
             # 启动缓冲区自动保存
             self.buffer_manager.start_auto_save()
@@ -456,21 +649,13 @@ class SmartBoardApp:
             self.gui.start_btn.setEnabled(False)
             self.gui.stop_btn.setEnabled(True)
             self.gui.status_label.setText("运行中")
-            self.gui.status_label.setStyleSheet("""
-                QLabel {
-                    background-color: #52c41a;
-                    color: white;
-                    border: 1px solid #73d13d;
-                }
-            """)
+            self.gui.set_status_running(True)
             
             # 更新托盘状态
             self.tray_manager.update_monitoring_status(True)
             
             # 更新状态栏信息
             if settings['process_names'] and settings['foreground_detection']:
-                process_text = settings['process_names']
-                process_names = [name.strip() for name in process_text.split(',') if name.strip()]
                 if process_names:
                     monitor_text = f"正在监控: {', '.join(process_names)}"
                     self.gui.system_info_label.setText(monitor_text)
@@ -490,7 +675,7 @@ class SmartBoardApp:
             error_msg = f"启动监控失败: {str(e)}"
             self.update_status_message("error", error_msg)
             self.log_manager.add_log("ERROR", error_msg)
-            QMessageBox.critical(self.gui, "错误", error_msg)
+            QMessageBox.critical(self.gui if self.gui_ready else None, "错误", error_msg)
     
     def stop_monitoring(self):
         """停止监控"""
@@ -504,14 +689,23 @@ class SmartBoardApp:
                 self.monitor_thread.stop()
                 self.monitor_thread = None
             
+            # 处理队列中剩余的截图并停止队列定时器
+            self.capture_drain_timer.stop()
+            self.drain_capture_queue(limit=None)
+            # 等待已提交的编码任务完成（单线程池，空任务完成即表示之前的任务都已完成）
+            self.encoder_pool.submit(lambda: None).result()
+            self.drain_capture_queue(limit=None)
+            
             # 停止输入检测
             self.input_detector.stop_detection()
             
             # 停止缓冲区自动保存
             self.buffer_manager.stop_auto_save()
             
-            # 异步保存缓冲区剩余内容
-            QTimer.singleShot(0, self.buffer_manager._save_worker)
+            # 在后台线程中保存缓冲区剩余内容，不阻塞界面；
+            # 非守护线程，程序退出时解释器会等待剩余截图写完
+            self.final_save_thread = threading.Thread(target=self.buffer_manager._save_worker, daemon=False)
+            self.final_save_thread.start()
             
             # 更新状态
             self.is_monitoring = False
@@ -521,13 +715,7 @@ class SmartBoardApp:
             self.gui.start_btn.setEnabled(True)
             self.gui.stop_btn.setEnabled(False)
             self.gui.status_label.setText("已停止")
-            self.gui.status_label.setStyleSheet("""
-                QLabel {
-                    background-color: #ff4d4f;
-                    color: white;
-                    border: 1px solid #ff7875;
-                }
-            """)
+            self.gui.set_status_running(False)
             
             # 更新托盘状态
             self.tray_manager.update_monitoring_status(False)
@@ -544,15 +732,57 @@ class SmartBoardApp:
             self.update_status_message("error", error_msg)
             self.log_manager.add_log("ERROR", error_msg)
     
-    def handle_capture(self, pixmap):
-        """处理截图"""
+    def drain_capture_queue(self, limit=10):
+        """处理编码完成的截图，并取出监控线程放入队列的截图提交编码，每次最多提交limit张"""
+        while True:
+            try:
+                future = self.encoded_queue.get_nowait()
+            except queue.Empty:
+                break
+            self.finish_capture(future)
+        
+        count = 0
+        while limit is None or count < limit:
+            try:
+                slot = self.capture_queue.get_nowait()
+            except queue.Empty:
+                break
+            self.handle_capture(slot)
+            count += 1
+    
+    def handle_capture(self, slot):
+        """处理截图：提交到编码线程（slot为帧缓冲池槽位，编码完成后归还）"""
+        # 只有在监控状态下才处理截图
+        if not self.is_monitoring:
+            self.frame_pool.release(slot)
+            return
+        
+        try:
+            future = self.encoder_pool.submit(self.encode_capture, slot)
+        except Exception as e:
+            self.frame_pool.release(slot)
+            error_msg = f"处理截图时出错: {str(e)}"
+            self.update_status_message("error", error_msg)
+            self.log_manager.add_log("ERROR", error_msg)
+            return
+        future.add_done_callback(self.encoded_queue.put)
+    
+    def encode_capture(self, slot):
+        """在编码线程中将槽位中的截图编码到内存，完成后归还槽位"""
+        try:
+            return self.screenshot_manager.save_to_memory(self.frame_pool.image(slot),
+                                                          self.buffer_manager.acquire_bytes())
+        finally:
+            self.frame_pool.release(slot)
+    
+    def finish_capture(self, future):
+        """编码完成后在主线程中加入缓冲区并更新统计信息"""
         try:
             # 只有在监控状态下才处理截图
             if not self.is_monitoring:
                 return
-                
-            # 保存截图到内存
-            image_data = self.screenshot_manager.save_to_memory(pixmap)
+            
+            image_data = future.result()
             if image_data:
                 # 传递截图管理器用于获取时间戳
                 self.buffer_manager.add_to_buffer(image_data, self.screenshot_manager)
@@ -563,7 +793,7 @@ class SmartBoardApp:
                 
                 # 更新GUI
                 self.gui.update_capture_count(self.capture_count)
-                self.gui.update_last_capture(self.last_capture_time.strftime("%H:%M:%S"))
+                self.gui.update_last_capture(_fmt_hms(self.last_capture_time))
                 self.gui.update_activity_status(True)
                 
         except Exception as e:
@@ -572,20 +802,37 @@ class SmartBoardApp:
             self.log_manager.add_log("ERROR", error_msg)
     
     def on_buffer_updated(self, size, max_size):
-        """缓冲区更新回调"""
+        """缓冲区更新回调（大小未变化时不刷新界面）"""
+        if (size, max_size) == self._last_buf:
+            return
+        self._last_buf = (size, max_size)
+        
         self.gui.update_buffer_progress(size, max_size)
         
-        # 计算内存使用（估算：每张截图约0.5MB）
+        # 计算内存使用（估算：每张截图约0.5MB），数值变化时才重新格式化
         estimated_mb = size * 0.5
-        self.gui.update_memory_usage(f"{estimated_mb:.1f} MB")
+        if estimated_mb != self._last_estimated_mb:
+            self._last_estimated_mb = estimated_mb
+            self.gui.update_memory_usage(f"{estimated_mb:.1f} MB")
     
     def on_settings_changed(self, settings):
         """处理设置变更（实时应用）"""
         try:
-            # 立即保存配置到磁盘
+            # 保存配置（短时间内的多次修改合并写盘）
             self.config.update(settings)
             self.config_manager.save_config(self.config)
             
+            # 保存时间点有变化时更新缓存
+            if 'save_times' in settings and sorted(settings['save_times']) != self._sorted_save_times:
+                self.update_save_times_cache(settings['save_times'])
+                self.calculate_next_save_time()
+            
+            # 图片格式和质量对之后的截图立即生效
+            if 'image_format' in settings:
+                self.screenshot_manager.set_image_format(settings['image_format'])
+            if 'image_quality' in settings:
+                self.screenshot_manager.set_image_quality(settings['image_quality'])
+            
             if self.is_monitoring and self.monitor_thread:
                 # 更新截图间隔
                 if 'capture_interval' in settings:
@@ -612,13 +859,7 @@ class SmartBoardApp:
                 
                 # 更新进程名
                 if 'process_names' in settings:
-                    if settings['process_names']:
-                        self.monitor_thread.process_names = [
-                            name.strip() for name in settings['process_names'].split(',')
-                            if name.strip()
-                        ]
-                    else:
-                        self.monitor_thread.process_names = []
+                    self.monitor_thread.set_process_names(parse_process_names(settings['process_names']))
                     
                     if self.monitor_thread.process_names:
                         msg = f"监控进程已更新: {', '.join(self.monitor_thread.process_names)}"
@@ -643,7 +884,7 @@ class SmartBoardApp:
     def update_volume_estimate(self):
         """更新体积估计"""
         try:
-            buffer_size = self.gui.buffer_size_spin.value()
+            buffer_size = self.gui.get_settings()['buffer_size']
             estimated_mb = buffer_size * 0.5  # 每张截图0.5MB
             estimated_gb = estimated_mb / 1024
             
@@ -661,11 +902,9 @@ class SmartBoardApp:
         if not self.is_monitoring:
             return
             
-        current_time = datetime.now().strftime("%H:%M")
-        settings = self.gui.get_settings()
-        save_times = settings['save_times']
+        current_time = _fmt_hm(datetime.now())
         
-        if current_time in save_times:
+        if current_time in self._save_time_set:
             try:
                 # 执行保存
                 self.buffer_manager._save_worker()
@@ -692,29 +931,24 @@ class SmartBoardApp:
     
     def calculate_next_save_time(self):
         """计算下次保存时间"""
-        settings = self.gui.get_settings()
-        save_times = settings['save_times']
+        save_times = self._sorted_save_times
         if not save_times:
             self.gui.update_next_save_time("未设置")
             self.next_save_time = None
             return
         
         current_time = datetime.now()
-        current_time_str = current_time.strftime("%H:%M")
-        
-        # 找到下一个保存时间点
-        next_time = None
-        for time_str in sorted(save_times):
-            if time_str > current_time_str:
-                next_time = time_str
-                break
+        current_time_str = _fmt_hm(current_time)
         
-        # 如果今天没有下一个时间点，使用明天的第一个时间点
-        if next_time is None and save_times:
-            next_time = sorted(save_times)[0]
-            next_save = current_time + timedelta(days=1)
-        else:
+        # 在已排序的时间点中二分查找下一个保存时间点
+        index = bisect.bisect_right(save_times, current_time_str)
+        if index < len(save_times):
+            next_time = save_times[index]
             next_save = current_time
+        else:
+            # 如果今天没有下一个时间点，使用明天的第一个时间点
+            next_time = save_times[0]
+            next_save = current_time + timedelta(days=1)
         
         # 设置具体时间
         hour, minute = map(int, next_time.split(':'))
@@ -723,16 +957,27 @@ class SmartBoardApp:
         self.next_save_time = next_save
         # 注意：精简版GUI中可能没有update_next_save_time方法
         # 所以我们只更新状态栏
-        self.gui.system_info_label.setText(f"下次保存: {next_save.strftime('%H:%M')}")
+        self.gui.system_info_label.setText(f"下次保存: {_fmt_hm(next_save)}")
     
     def update_gui_status(self):
         """更新GUI状态信息"""
+        self._tick += 1
+        
+        # 空闲检测（每5秒）
+        if self._tick % 5 == 0:
+            self.check_idle_time()
+        
+        # 保存时间检查（每30秒）
+        if self._tick % 30 == 0:
+            self.check_save_times()
+        
         # 更新下次保存时间（如果需要重新计算）
         if self.next_save_time and datetime.now() > self.next_save_time:
             self.calculate_next_save_time()
     
     def show_window(self):
-        """显示主窗口"""
+        """显示主窗口（静默启动后首次显示时创建界面）"""
+        self._ensure_gui()
         self.gui.showNormal()
         self.gui.activateWindow()
         self.gui.raise_()
@@ -750,13 +995,26 @@ class SmartBoardApp:
             settings = self.gui.get_settings()
             self.config.update(settings)
             self.config_manager.save_config(self.config)
+            self.config_manager.flush()
         except Exception as e:
             print(f"保存配置失败: {e}")
         
+        # 写入尚未保存的进程历史记录，停止后台进程遍历线程
+        if self.gui_ready:
+            self.gui.flush_process_history()
+            self.gui.stop_process_scan()
+        
         # 异步停止监控，避免卡顿
         if self.is_monitoring:
             self.stop_monitoring()
         
+        # 不再接受新的编码任务
+        self.encoder_pool.shutdown(wait=False)
+        
+        # 界面最多等待2秒，未写完的截图在解释器退出前继续保存
+        if self.final_save_thread:
+            self.final_save_thread.join(timeout=2)
+        
         # 延迟退出，确保资源释放
         QTimer.singleShot(500, self.app.quit)
     
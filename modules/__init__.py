@@ -9,7 +9,7 @@ __author__ = "SmartBoardMonitor Team"
 
 from .gui import SmartBoardGUI
 from .detector import InputDetector, WindowsInkDetector
-from .screenshot import ScreenshotManager
+from .screenshot import ScreenshotManager, FrameBufferPool
 from .buffer import BufferManager
 from .config import ConfigManager
 from .tray import SystemTrayManager
@@ -20,6 +20,7 @@ __all__ = [
     'InputDetector',
     'WindowsInkDetector',
     'ScreenshotManager',
+    'FrameBufferPool',
     'BufferManager',
     'ConfigManager',
     'SystemTrayManager',
@@ -4,14 +4,138 @@
 缓冲区管理模块 - 管理内存缓冲区
 """
 
+import io
 import os
+import math
 import time
 import hashlib
-from datetime import datetime
-from queue import Queue
+from collections import OrderedDict, deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from threading import Thread, Event, Lock
 from PyQt5.QtCore import QObject, pyqtSignal
-from PyQt5.QtGui import QPixmap
+from PyQt5.QtGui import QImage
+
+# xxhash为可选依赖，未安装时使用标准库的blake2b
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+# Pillow用于近似重复检测（感知哈希），未安装时只做精确去重
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+# 去重时先只比较的前缀长度（字节）
+PREFIX_HASH_SIZE = 4096
+
+# 去重历史最多保留的哈希数量，超过后淘汰最久未出现的
+DEDUP_HISTORY_SIZE = 1000
+
+# prefix_index中表示该前缀下的图片已计算过完整哈希
+_FULL_HASHED = object()
+
+# 缓冲区中的一张截图
+BufferedCapture = namedtuple('BufferedCapture', 'data timestamp filepath date_str filename')
+
+# 小于该大小的编码数据缓冲区不放回池中
+MIN_POOLED_BYTES = 64 * 1024
+
+# 星期名称，按time.struct_time.tm_wday索引（周一为0）
+WEEKDAYS = ("周一", "周二", "周三", "周四", "周五", "周六", "周日")
+
+# 已编码图片数据的文件头：PNG、JPEG、WEBP（RIFF）
+ENCODED_IMAGE_SIGNATURES = (b'\x89PNG', b'\xff\xd8\xff', b'RIFF')
+
+
+def write_encoded(filepath, data):
+    """将编码好的图片数据直接写入文件（无缓冲，通常一次write即可写完）"""
+    view = memoryview(data)
+    with open(filepath, 'wb', buffering=0) as f:
+        # 无缓冲写入可能只写入部分数据，通过memoryview切片继续写剩余部分，不复制数据
+        while view:
+            view = view[f.write(view):]
+
+
+# 感知哈希：32x32灰度图做DCT，取左上角8x8低频系数
+_PHASH_SIZE = 32
+_PHASH_KEEP = 8
+_DCT_MATRIX = [[math.cos(math.pi * (2 * x + 1) * u / (2 * _PHASH_SIZE)) for x in range(_PHASH_SIZE)]
+               for u in range(_PHASH_KEEP)]
+
+
+def perceptual_hash(image_data):
+    """计算图片的64位感知哈希（pHash）"""
+    image = Image.open(io.BytesIO(image_data))
+    # JPEG可以直接按缩小的尺寸解码
+    image.draft('L', (_PHASH_SIZE * 4, _PHASH_SIZE * 4))
+    pixels = list(image.convert('L').resize((_PHASH_SIZE, _PHASH_SIZE), Image.BILINEAR).getdata())
+    
+    # 行变换，每行只计算需要的低频系数
+    rows = [[sum(c * p for c, p in zip(coefs, pixels[y * _PHASH_SIZE:(y + 1) * _PHASH_SIZE]))
+             for coefs in _DCT_MATRIX] for y in range(_PHASH_SIZE)]
+    # 列变换
+    dct = [sum(coefs[y] * rows[y][v] for y in range(_PHASH_SIZE))
+           for coefs in _DCT_MATRIX for v in range(_PHASH_KEEP)]
+    
+    # 与中位数比较得到64位哈希
+    ordered = sorted(dct)
+    median = (ordered[31] + ordered[32]) / 2
+    bits = 0
+    for value in dct:
+        bits = (bits << 1) | (value > median)
+    return bits
+
+
+def hamming_distance(a, b):
+    """两个哈希之间的汉明距离"""
+    return bin(a ^ b).count('1')
+
+
+class BKTree:
+    """按汉明距离组织的BK树，用于查找相近的感知哈希"""
+    
+    def __init__(self):
+        self.root = None  # 节点为 (哈希值, {距离: 子节点})
+        self.size = 0
+    
+    def add(self, value):
+        """添加哈希值"""
+        if self.root is None:
+            self.root = (value, {})
+            self.size = 1
+            return
+        node = self.root
+        while True:
+            distance = hamming_distance(value, node[0])
+            if distance == 0:
+                return
+            child = node[1].get(distance)
+            if child is None:
+                node[1][distance] = (value, {})
+                self.size += 1
+                return
+            node = child
+    
+    def contains_near(self, value, max_distance):
+        """是否存在与value距离不超过max_distance的哈希"""
+        stack = [self.root] if self.root else []
+        while stack:
+            node_value, children = stack.pop()
+            distance = hamming_distance(value, node_value)
+            if distance <= max_distance:
+                return True
+            for child_distance, child in children.items():
+                if distance - max_distance <= child_distance <= distance + max_distance:
+                    stack.append(child)
+        return False
+    
+    def clear(self):
+        """清空"""
+        self.root = None
+        self.size = 0
+
 
 class BufferManager(QObject):
     """管理内存缓冲区"""
@@ -22,7 +146,7 @@ class BufferManager(QObject):
     def __init__(self, log_manager=None, screenshot_manager=None):
         super().__init__()
         self.max_size = 100  # 最大100张截图
-        self.ram_buffer = Queue(maxsize=self.max_size)
+        self.ram_buffer = deque()  # BufferedCapture队列，加入和取出时持有self.lock
         self.save_interval = 300  # 默认5分钟
         self.save_path = "./screenshots"
         self.auto_save_thread = None
@@ -30,8 +154,18 @@ class BufferManager(QObject):
         self.log_manager = log_manager
         self.screenshot_manager = screenshot_manager
         self.lock = Lock()
+        self._save_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="save")  # 并行写入截图文件
         self.buffer_count = 0
-        self.image_hashes = set()  # 用于存储已存在的图片哈希值
+        self._byte_pool = []  # 可复用的编码数据缓冲区（bytearray），数量不超过max_size
+        self.image_hashes = OrderedDict()  # 已存在的图片哈希值（LRU，保存后不清空）
+        self._ensured_dirs = {}  # 已创建的日期目录 -> 实际写入目录
+        self._cached_date_day = None  # 缓存的日期 (年, 年内第几天)
+        self._cached_date_str = None  # 该日期对应的文件夹名
+        # 前缀哈希 -> 首张图片数据（前缀重复前不计算完整哈希）
+        self.prefix_index = OrderedDict()
+        # 近似重复检测：感知哈希汉明距离不超过该值视为重复，0表示只做精确去重
+        self.near_duplicate_distance = 0
+        self.phash_tree = BKTree()
         
         # 确保保存目录存在（解决权限问题）
         self.ensure_save_directory()
@@ -64,81 +198,107 @@ class BufferManager(QObject):
             if self.log_manager:
                 self.log_manager.add_log("ERROR", error_msg)
             print(error_msg)
+        
+        # 带结尾分隔符的保存路径，添加截图时直接拼接日期目录
+        self._save_dir_prefix = os.path.join(self.save_path, "")
     
     def set_buffer_size(self, size):
         """设置缓冲区大小"""
+        dropped = []
         with self.lock:
             self.max_size = size
-            # 重新创建队列
-            old_buffer = list(self.ram_buffer.queue)
-            self.ram_buffer = Queue(maxsize=size)
-            for item in old_buffer[:size]:  # 只保留前size个
-                self.ram_buffer.put(item)
+            # 只保留前size个
+            while len(self.ram_buffer) > size:
+                dropped.append(self.ram_buffer.pop().data)
+        
+        # 丢弃的截图不会再保存，补算完整哈希后前缀索引不再引用其数据，再归还数据缓冲区
+        if dropped:
+            self._resolve_prefix_refs(dropped)
+            for data in dropped:
+                self.release_bytes(data)
     
     def add_to_buffer(self, image_data, screenshot_manager=None):
-        """添加截图到缓冲区，自动去重"""
-        with self.lock:
-            # 计算图片哈希值
-            image_hash = self.calculate_image_hash(image_data)
-            
-            # 检查是否重复
-            if image_hash and image_hash in self.image_hashes:
-                if self.log_manager:
-                    self.log_manager.add_log("INFO", "检测到重复截图，已跳过")
-                return  # 重复截图，直接返回
-            
-            # 如果是新截图，添加到哈希集合
-            if image_hash:
-                self.image_hashes.add(image_hash)
-            
-            # 检查缓冲区是否已满
-            if self.ram_buffer.full():
-                # 缓冲区满时启动保存
-                self.buffer_full_signal.emit()
-                self._save_worker()
-            
-            timestamp = time.time()
-            
-            # 使用screenshot_manager获取带星期的文件夹名
-            if screenshot_manager and hasattr(screenshot_manager, 'get_date_folder_name'):
-                date_str = screenshot_manager.get_date_folder_name()
-            else:
-                # 备用方法
-                now = datetime.fromtimestamp(timestamp)
-                weekdays = ["周一", "周二", "周三", "周四", "周五", "周六", "周日"]
-                weekday = weekdays[now.weekday()]
-                date_str = f"{now.strftime('%Y-%m-%d')}_{weekday}"
-            
-            # 创建日期目录
-            date_dir = os.path.join(self.save_path, date_str)
-            try:
-                os.makedirs(date_dir, exist_ok=True)
-            except PermissionError:
-                # 如果无法创建目录，使用备用路径
-                user_docs = os.path.join(os.path.expanduser("~"), "Documents", "SmartBoardScreenshots", date_str)
-                date_dir = user_docs
-                os.makedirs(date_dir, exist_ok=True)
-            
-            # 生成文件名
-            filename = datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d-%H-%M-%S.png")
-            filepath = os.path.join(date_dir, filename)
-            
-            self.ram_buffer.put({
-                'data': image_data,
-                'timestamp': timestamp,
-                'filepath': filepath,
-                'date_str': date_str,
-                'filename': filename,
-                'hash': image_hash  # 保存哈希值
-            })
-            
-            self.buffer_count = self.ram_buffer.qsize()
-            
-            # 发射更新信号
-            self.buffer_updated.emit(self.buffer_count, self.max_size)
-            
+        """添加截图到缓冲区，自动去重
+
+        image_data为编码后的bytes、memoryview或从acquire_bytes()取得的bytearray，缓冲区接管并直接
+        保存其引用，不再复制，保存后bytearray会归还到池中；其他类型（如QByteArray）会先转换为bytes
+        """
+        if not isinstance(image_data, (bytes, bytearray, memoryview)):
+            image_data = bytes(image_data)
+        
+        # 检查是否重复（哈希在锁外计算，锁内只做查找和插入）
+        if self.is_exact_duplicate(image_data):
+            # 完全重复的截图不会被去重索引引用，缓冲区可以直接复用
+            self.release_bytes(image_data)
             if self.log_manager:
-                self.log_manager.add_log("INFO", f"截图已添加到缓冲区 ({self.buffer_count}/{self.max_size})")
+                self.log_manager.add_log("INFO", "检测到重复截图，已跳过")
+            return  # 重复截图，直接返回
+        
+        if self.near_duplicate_distance and self.is_near_duplicate(image_data):
+            # 截图被丢弃，前缀索引改为记录完整哈希，不再引用其数据，之后归还数据缓冲区
+            self._resolve_prefix_refs((image_data,))
+            self.release_bytes(image_data)
+            if self.log_manager:
+                self.log_manager.add_log("INFO", "检测到近似重复截图，已跳过")
+            return
+        
+        timestamp = time.time()
+        tm = time.localtime(timestamp)
+        
+        # 带星期的日期文件夹名，同一天内复用
+        date_str = self.get_date_folder_name(tm)
+        
+        # 创建日期目录（已创建过的目录直接使用缓存）
+        date_dir = self._ensure_dir(f"{self._save_dir_prefix}{date_str}", date_str)
+        
+        # 生成文件名，扩展名与截图编码格式一致
+        if screenshot_manager and hasattr(screenshot_manager, 'get_file_extension'):
+            extension = screenshot_manager.get_file_extension()
+        else:
+            extension = "png"
+        filename = (f"{tm.tm_year:04d}-{tm.tm_mon:02d}-{tm.tm_mday:02d}-"
+                    f"{tm.tm_hour:02d}-{tm.tm_min:02d}-{tm.tm_sec:02d}.{extension}")
+        filepath = f"{date_dir}{os.sep}{filename}"
+        
+        # 检查缓冲区是否已满
+        if len(self.ram_buffer) >= self.max_size:
+            # 缓冲区满时立即取出全部截图腾出空间，在后台线程中写入，不阻塞截图
+            self.buffer_full_signal.emit()
+            batch = self._drain_buffer()
+            if batch:
+                Thread(target=self._save_batch, args=(batch,), daemon=True).start()
+        
+        # 与_drain_buffer的整体交换互斥，保证截图不会加入已被取走的队列
+        with self.lock:
+            self.ram_buffer.append(BufferedCapture(image_data, timestamp, filepath, date_str, filename))
+            self.buffer_count = len(self.ram_buffer)
+        
+        # 发射更新信号
+        self.buffer_updated.emit(self.buffer_count, self.max_size)
+        
+        if self.log_manager:
+            self.log_manager.add_log("INFO", f"截图已添加到缓冲区 ({self.buffer_count}/{self.max_size})")
+    
+    def acquire_bytes(self):
+        """从池中取出一个可复用的编码数据缓冲区，池为空时新建"""
+        try:
+            return self._byte_pool.pop()
+        except IndexError:
+            return bytearray()
+    
+    def release_bytes(self, data):
+        """归还编码数据缓冲区（不清空内容，以保留已分配的内存）"""
+        if (isinstance(data, bytearray) and len(data) >= MIN_POOLED_BYTES
+                and len(self._byte_pool) < self.max_size):
+            self._byte_pool.append(data)
+    
+    def get_date_folder_name(self, tm):
+        """获取带星期的日期文件夹名称（格式: 2023-10-01_周日），按天缓存"""
+        day = (tm.tm_year, tm.tm_yday)
+        if day != self._cached_date_day:
+            self._cached_date_str = f"{tm.tm_year:04d}-{tm.tm_mon:02d}-{tm.tm_mday:02d}_{WEEKDAYS[tm.tm_wday]}"
+            self._cached_date_day = day
+        return self._cached_date_str
     
     def start_auto_save(self):
         """启动自动保存线程"""
@@ -166,78 +326,204 @@ class BufferManager(QObject):
             self.stop_event.wait(self.save_interval)
     
     def _save_worker(self):
-        """保存缓冲区内容到文件"""
-        if self.ram_buffer.empty():
-            return
-        
-        saved_count = 0
-        # 保存所有缓冲区内容
-        while not self.ram_buffer.empty():
-            try:
-                item = self.ram_buffer.get()
-                filepath = item['filepath']
-                date_str = item['date_str']
-                
-                # 确保日期目录存在
-                try:
-                    date_dir = os.path.dirname(filepath)
-                    os.makedirs(date_dir, exist_ok=True)
-                except PermissionError:
-                    # 如果无法创建目录，使用备用路径
-                    user_docs = os.path.join(os.path.expanduser("~"), "Documents", "SmartBoardScreenshots", date_str)
-                    filepath = os.path.join(user_docs, os.path.basename(filepath))
-                    os.makedirs(user_docs, exist_ok=True)
-                
-                # 从内存数据创建QPixmap并保存
-                pixmap = QPixmap()
-                pixmap.loadFromData(item['data'])
-                if not pixmap.isNull():
-                    # 尝试保存，如果失败则尝试备用路径
-                    try:
-                        pixmap.save(filepath, "PNG")
-                    except Exception as save_error:
-                        # 使用用户文档目录作为备用
-                        user_docs = os.path.join(os.path.expanduser("~"), "Documents", "SmartBoardScreenshots", date_str)
-                        backup_path = os.path.join(user_docs, os.path.basename(filepath))
-                        os.makedirs(user_docs, exist_ok=True)
-                        pixmap.save(backup_path, "PNG")
-                        filepath = backup_path
-                    
-                    saved_count += 1
-                    
-                    if self.log_manager:
-                        self.log_manager.add_log("INFO", f"已保存截图: {os.path.basename(filepath)}")
-                    
-            except Exception as e:
-                error_msg = f"保存截图时出错: {e}"
-                print(error_msg)
-                if self.log_manager:
-                    self.log_manager.add_log("ERROR", error_msg)
+        """保存缓冲区内容到文件（先一次取出全部截图，再批量写入）"""
+        batch = self._drain_buffer()
+        if batch:
+            self._save_batch(batch)
+    
+    def _save_batch(self, batch):
+        """写入已从缓冲区取出的一批截图"""
+        saved_count = self._write_batch(batch)
         
         # 更新缓冲区计数
-        self.buffer_count = self.ram_buffer.qsize()
+        self.buffer_count = len(self.ram_buffer)
         self.buffer_updated.emit(self.buffer_count, self.max_size)
         
-        # 清理已保存图片的哈希值
-        self.image_hashes.clear()
+        # 去重历史跨保存周期保留，归还数据缓冲区前先补算仍被前缀索引引用的完整哈希
+        self._resolve_prefix_refs([item.data for item in batch])
+        
+        # 截图已写入且不再被去重索引引用，归还数据缓冲区供后续编码复用
+        for item in batch:
+            self.release_bytes(item.data)
         
         if saved_count > 0 and self.log_manager:
             self.log_manager.add_log("INFO", f"已保存 {saved_count} 张截图")
     
+    def _resolve_prefix_refs(self, datas):
+        """为前缀索引中引用这些截图数据的条目补算完整哈希，之后这些数据不再被引用"""
+        batch_ids = {id(data) for data in datas}
+        with self.lock:
+            pending = [(prefix_hash, data) for prefix_hash, data in self.prefix_index.items()
+                       if id(data) in batch_ids]
+        
+        # 数据缓冲区在归还前不会被修改，可以在锁外计算哈希
+        resolved = [(prefix_hash, data, self.calculate_image_hash(data)) for prefix_hash, data in pending]
+        
+        with self.lock:
+            for prefix_hash, data, image_hash in resolved:
+                if self.prefix_index.get(prefix_hash) is data:
+                    self.prefix_index[prefix_hash] = _FULL_HASHED
+                    if image_hash is not None:
+                        self._remember_hash(image_hash)
+    
+    def _remember_hash(self, image_hash):
+        """记录完整哈希，超过容量时淘汰最久未出现的（需持有self.lock）"""
+        self.image_hashes[image_hash] = None
+        self.image_hashes.move_to_end(image_hash)
+        if len(self.image_hashes) > DEDUP_HISTORY_SIZE:
+            self.image_hashes.popitem(last=False)
+    
+    def _drain_buffer(self):
+        """一次性取出缓冲区中的所有截图（持有一次锁，将整个队列换成空队列）"""
+        with self.lock:
+            batch, self.ram_buffer = self.ram_buffer, deque()
+        return batch
+    
+    def _ensure_dir(self, date_dir, date_str):
+        """确保日期目录存在并返回实际写入目录，每个目录只创建一次"""
+        target_dir = self._ensured_dirs.get(date_dir)
+        if target_dir is None:
+            target_dir = self._prepare_dir(date_dir, date_str)
+            self._ensured_dirs[date_dir] = target_dir
+        return target_dir
+    
+    def _prepare_dir(self, date_dir, date_str):
+        """确保日期目录存在，无权限时返回备用目录"""
+        try:
+            os.makedirs(date_dir, exist_ok=True)
+            return date_dir
+        except PermissionError:
+            # 如果无法创建目录，使用备用路径
+            user_docs = os.path.join(os.path.expanduser("~"), "Documents", "SmartBoardScreenshots", date_str)
+            os.makedirs(user_docs, exist_ok=True)
+            return user_docs
+    
+    def _write_batch(self, batch):
+        """用线程池并行写入一批截图"""
+        return sum(self._save_pool.map(self._write_one, batch))
+    
+    def _write_one(self, item):
+        """写入单张截图，成功返回True"""
+        try:
+            filepath = item.filepath
+            date_str = item.date_str
+            
+            # 确保日期目录存在
+            date_dir = os.path.dirname(filepath)
+            target_dir = self._ensure_dir(date_dir, date_str)
+            filepath = f"{target_dir}{os.sep}{item.filename}"
+            
+            data = item.data
+            if bytes(memoryview(data)[:4]).startswith(ENCODED_IMAGE_SIGNATURES):
+                # 已是编码好的图片数据，直接写入文件，不再解码后重新编码
+                save = lambda path: write_encoded(path, data)
+            else:
+                # 其他数据通过QImage解码后保存（格式由扩展名决定）
+                image = QImage()
+                image.loadFromData(data)
+                if image.isNull():
+                    return False
+                save = image.save
+            
+            # 尝试保存，如果失败则尝试备用路径
+            try:
+                save(filepath)
+            except Exception as save_error:
+                # 目录可能已被删除，下次重新创建
+                self._ensured_dirs.pop(date_dir, None)
+                # 使用用户文档目录作为备用
+                user_docs = os.path.join(os.path.expanduser("~"), "Documents", "SmartBoardScreenshots", date_str)
+                backup_path = os.path.join(user_docs, os.path.basename(filepath))
+                os.makedirs(user_docs, exist_ok=True)
+                save(backup_path)
+                filepath = backup_path
+            
+            if self.log_manager:
+                self.log_manager.add_log("INFO", f"已保存截图: {os.path.basename(filepath)}")
+            return True
+                
+        except Exception as e:
+            error_msg = f"保存截图时出错: {e}"
+            print(error_msg)
+            if self.log_manager:
+                self.log_manager.add_log("ERROR", error_msg)
+            return False
+    
     def set_save_path(self, path):
         """设置保存路径"""
         self.save_path = path
+        self._ensured_dirs.clear()
         self.ensure_save_directory()
         
         if self.log_manager:
             self.log_manager.add_log("INFO", f"保存路径设置为: {path}")
     
+    def set_near_duplicate_distance(self, distance):
+        """设置近似重复检测的汉明距离阈值（0为关闭）"""
+        if distance and Image is None:
+            if self.log_manager:
+                self.log_manager.add_log("WARNING", "未安装Pillow，无法启用近似重复检测")
+            distance = 0
+        with self.lock:
+            self.near_duplicate_distance = distance
+            self.phash_tree.clear()
+    
+    def is_near_duplicate(self, image_data):
+        """按感知哈希判断是否与已有截图近似重复"""
+        try:
+            phash = perceptual_hash(image_data)
+        except Exception as e:
+            print(f"计算感知哈希失败: {e}")
+            return False
+        
+        with self.lock:
+            if self.phash_tree.contains_near(phash, self.near_duplicate_distance):
+                return True
+            # BK树不支持删除，超过容量时整体重建
+            if self.phash_tree.size >= DEDUP_HISTORY_SIZE:
+                self.phash_tree.clear()
+            self.phash_tree.add(phash)
+            return False
+    
+    def is_exact_duplicate(self, image_data):
+        """判断截图内容是否与已有截图完全相同
+
+        先只对前4KB计算哈希，前缀未出现过的截图一定不重复，无需计算完整哈希；
+        前缀相同时再计算完整哈希确认。新图片的哈希在锁外计算
+        """
+        prefix_hash = self.calculate_image_hash(memoryview(image_data)[:PREFIX_HASH_SIZE])
+        with self.lock:
+            first = self.prefix_index.get(prefix_hash)
+            if first is None:
+                self.prefix_index[prefix_hash] = image_data
+                if len(self.prefix_index) > DEDUP_HISTORY_SIZE:
+                    self.prefix_index.popitem(last=False)
+                return False
+            self.prefix_index.move_to_end(prefix_hash)
+            
+            # 前缀相同，补算该前缀下首张图片的完整哈希（持有锁，保证其数据缓冲区此时不会被归还复用）
+            if first is not _FULL_HASHED:
+                first_hash = self.calculate_image_hash(first)
+                if first_hash is not None:
+                    self._remember_hash(first_hash)
+                self.prefix_index[prefix_hash] = _FULL_HASHED
+        
+        image_hash = self.calculate_image_hash(image_data)
+        
+        with self.lock:
+            if image_hash is None:
+                return False
+            duplicate = image_hash in self.image_hashes
+            self._remember_hash(image_hash)
+            return duplicate
+    
     def calculate_image_hash(self, image_data):
         """计算图片的哈希值用于去重"""
         try:
-            # 使用MD5哈希算法
-            md5_hash = hashlib.md5(image_data).hexdigest()
-            return md5_hash
+            # 去重不需要加密哈希，优先使用xxh3，返回整数便于集合查找
+            if xxhash:
+                return xxhash.xxh3_64_intdigest(image_data)
+            return int.from_bytes(hashlib.blake2b(image_data, digest_size=8).digest(), 'little')
         except Exception as e:
             print(f"计算图片哈希失败: {e}")
             return None
@@ -8,7 +8,58 @@ import os
 import json
 import sys
 from pathlib import Path
-from PyQt5.QtCore import QSettings
+from PyQt5.QtCore import QSettings, QTimer
+
+def _coerce_bool(value, default):
+    """转换布尔值，处理字符串形式的布尔值"""
+    if value is None:
+        return default
+    if isinstance(value, str):
+        return value.lower() in ('true', '1', 'yes')
+    return bool(value)
+
+
+def _coerce_int(value, default):
+    """转换整数，先转float再转int，处理"5.0"这种情况"""
+    if value is None:
+        return default
+    try:
+        return int(float(value))
+    except (ValueError, TypeError):
+        return default
+
+
+def _coerce_float(value, default):
+    """转换浮点数"""
+    if value is None:
+        return default
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return default
+
+
+def _coerce_list(value, default):
+    """转换逗号分隔的列表（如保存时间列表）"""
+    if value and isinstance(value, str):
+        return value.split(',')
+    return default
+
+
+def _coerce_str(value, default):
+    """转换字符串"""
+    return str(value) if value is not None else default
+
+
+# 默认值类型 -> 类型转换函数
+_COERCERS = {
+    bool: _coerce_bool,
+    int: _coerce_int,
+    float: _coerce_float,
+    list: _coerce_list,
+    str: _coerce_str,
+}
+
 
 class ConfigManager:
     def __init__(self, config_file="config.ini"):
@@ -28,6 +79,12 @@ class ConfigManager:
         self.base_dir = base_dir  # 保存基础目录
         self.settings = QSettings(config_file, QSettings.IniFormat)
         
+        # 连续保存时合并写盘：最后一次保存500毫秒后才同步到磁盘，退出时调用flush()
+        self._sync_timer = QTimer()
+        self._sync_timer.setSingleShot(True)
+        self._sync_timer.setInterval(500)
+        self._sync_timer.timeout.connect(self.settings.sync)
+        
         self.default_config = {
             'auto_start': False,
             'silent_start': False,
@@ -38,8 +95,18 @@ class ConfigManager:
             'foreground_detection': True,
             'ink_detection': True,
             'process_names': '',
-            'save_path': 'screenshots'
+            'save_path': 'screenshots',
+            'image_format': 'jpg',         # 截图编码格式：jpg/webp/png
+            'image_quality': 85,           # jpg/webp的编码质量（1-100）
+            'near_duplicate_distance': 0   # 近似重复检测的感知哈希距离，0为只做精确去重
         }
+        
+        # 每个配置项按默认值类型预先选好类型转换函数
+        self._coercers = {key: _COERCERS.get(type(value), _coerce_str)
+                          for key, value in self.default_config.items()}
+        
+        # 已加载并完成类型转换的配置，save_config后失效
+        self._config_cache = None
     
     def get_absolute_path(self, path):
         """将相对路径转换为绝对路径"""
@@ -54,51 +121,17 @@ class ConfigManager:
         return os.path.join(self.base_dir, path)
     
     def load_config(self):
-        """加载配置文件 - 确保类型转换正确"""
+        """加载配置文件 - 确保类型转换正确（未保存过新配置时返回缓存的副本）"""
+        if self._config_cache is not None:
+            return self._copy_config(self._config_cache)
+        
+        # 一次性读取所有已保存的配置项，再逐项做类型转换
+        stored = {key: self.settings.value(key) for key in self.settings.allKeys()}
+        
         config = {}
         for key, default_value in self.default_config.items():
             try:
-                if isinstance(default_value, bool):
-                    value = self.settings.value(key, default_value)
-                    # 处理字符串形式的布尔值
-                    if isinstance(value, str):
-                        config[key] = value.lower() in ('true', '1', 'yes')
-                    else:
-                        config[key] = bool(value) if value is not None else default_value
-                
-                elif isinstance(default_value, int):
-                    value = self.settings.value(key, default_value)
-                    # 确保转换为整数
-                    if value is not None:
-                        try:
-                            config[key] = int(float(value))  # 先转float再转int，处理"5.0"这种情况
-                        except (ValueError, TypeError):
-                            config[key] = default_value
-                    else:
-                        config[key] = default_value
-                
-                elif isinstance(default_value, float):
-                    value = self.settings.value(key, default_value)
-                    if value is not None:
-                        try:
-                            config[key] = float(value)
-                        except (ValueError, TypeError):
-                            config[key] = default_value
-                    else:
-                        config[key] = default_value
-                
-                elif isinstance(default_value, list):
-                    # 处理时间列表
-                    value = self.settings.value(key, '')
-                    if value and isinstance(value, str):
-                        config[key] = value.split(',')
-                    else:
-                        config[key] = default_value
-                
-                else:
-                    value = self.settings.value(key, default_value)
-                    config[key] = str(value) if value is not None else default_value
-                    
+                config[key] = self._coercers[key](stored.get(key), default_value)
             except Exception as e:
                 print(f"加载配置项 {key} 时出错: {e}")
                 config[key] = default_value
@@ -107,7 +140,14 @@ class ConfigManager:
         if 'save_path' in config:
             config['save_path'] = self.get_absolute_path(config['save_path'])
         
-        return config
+        self._config_cache = config
+        return self._copy_config(config)
+    
+    @staticmethod
+    def _copy_config(config):
+        """复制配置，列表类型的值也复制一份，避免调用方修改缓存"""
+        return {key: list(value) if isinstance(value, list) else value
+                for key, value in config.items()}
     
     def save_config(self, config):
         """保存配置文件 - 确保类型正确"""
@@ -136,9 +176,15 @@ class ConfigManager:
             except Exception as e:
                 print(f"保存配置项 {key} 时出错: {e}")
         
-        # 立即同步到磁盘
+        # 延迟同步到磁盘，短时间内的多次保存只写一次
+        self._sync_timer.start()
+        self._config_cache = None
+        print("配置已保存")
+    
+    def flush(self):
+        """立即将尚未写盘的配置同步到磁盘"""
+        self._sync_timer.stop()
         self.settings.sync()
-        print("配置文件已保存并同步到磁盘")
     
     def set_auto_start(self, enable=True, silent=False):
         """设置开机自启动"""
@@ -175,6 +221,15 @@ class ConfigManager:
                 # 创建注册表项，包含工作目录
                 command_line = f'"{app_path}"{startup_args}'
                 
+                # 已有相同的注册表项时不再重复写入
+                try:
+                    with winreg.OpenKey(winreg.HKEY_CURRENT_USER, key_path, 0, winreg.KEY_READ) as key:
+                        existing_command, _ = winreg.QueryValueEx(key, app_name)
+                except FileNotFoundError:
+                    existing_command = None
+                if existing_command == command_line:
+                    return
+                
                 key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, key_path, 0, winreg.KEY_SET_VALUE)
                 winreg.SetValueEx(key, app_name, 0, winreg.REG_SZ, command_line)
                 winreg.CloseKey(key)
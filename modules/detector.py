@@ -9,6 +9,15 @@ import ctypes
 from ctypes import wintypes
 from PyQt5.QtCore import QObject, pyqtSignal
 
+# 空闲时间查询结果的缓存时长（秒），期间按经过的时间推算空闲时间
+IDLE_CACHE_SECONDS = 0.2
+
+# GetTickCount和dwTime都是32位计数，约49.7天回绕一次，相减后按32位取模
+TICK_MASK = 0xFFFFFFFF
+
+# 空闲时间小于该值（秒）认为有输入活动
+ACTIVITY_IDLE_SECONDS = 2.0
+
 class InputDetector(QObject):
     """检测用户输入活动（键盘、鼠标）"""
     
@@ -16,7 +25,7 @@ class InputDetector(QObject):
     
     def __init__(self):
         super().__init__()
-        self.last_input_time = time.time()
+        self.last_input_time = time.monotonic()
         self.is_detecting = False
         
         # Windows API 结构体
@@ -28,13 +37,35 @@ class InputDetector(QObject):
         
         self.last_input_info = LASTINPUTINFO()
         self.last_input_info.cbSize = ctypes.sizeof(LASTINPUTINFO)
+        self._last_input_ref = ctypes.byref(self.last_input_info)
+        
+        # 预先取得API函数并声明参数/返回类型，避免每次调用时查找和推断类型
+        self._GetLastInputInfo = ctypes.windll.user32.GetLastInputInfo
+        self._GetLastInputInfo.argtypes = [ctypes.POINTER(LASTINPUTINFO)]
+        self._GetLastInputInfo.restype = wintypes.BOOL
+        self._GetTickCount = ctypes.windll.kernel32.GetTickCount
+        self._GetTickCount.argtypes = []
+        self._GetTickCount.restype = wintypes.DWORD
+        
+        # 上次查询空闲时间的时刻和结果
+        self._idle_checked_at = None
+        self._idle_value = 0.0
+        
+    def get_idle_time(self, max_age=IDLE_CACHE_SECONDS):
+        """获取系统空闲时间（秒）
+
+        距上次查询不超过max_age秒时不再调用系统API，按经过的时间推算
+        """
+        now = time.monotonic()
+        if self._idle_checked_at is not None and now - self._idle_checked_at < max_age:
+            return self._idle_value + (now - self._idle_checked_at)
         
-    def get_idle_time(self):
-        """获取系统空闲时间（秒）"""
         try:
-            ctypes.windll.user32.GetLastInputInfo(ctypes.byref(self.last_input_info))
-            current_time = ctypes.windll.kernel32.GetTickCount()
-            idle_time = (current_time - self.last_input_info.dwTime) / 1000.0
+            self._GetLastInputInfo(self._last_input_ref)
+            current_time = self._GetTickCount()
+            idle_time = ((current_time - self.last_input_info.dwTime) & TICK_MASK) / 1000.0
+            self._idle_checked_at = now
+            self._idle_value = idle_time
             return idle_time
         except Exception as e:
             print(f"获取空闲时间失败: {e}")
@@ -43,7 +74,7 @@ class InputDetector(QObject):
     def start_detection(self):
         """开始检测输入活动"""
         self.is_detecting = True
-        self.last_input_time = time.time()
+        self.last_input_time = time.monotonic()
     
     def stop_detection(self):
         """停止检测输入活动"""
@@ -52,10 +83,13 @@ class InputDetector(QObject):
     def check_activity(self):
         """检查是否有输入活动"""
         idle_time = self.get_idle_time()
+        # 推算值接近阈值时重新查询，避免缓存期间的输入被漏掉
+        if idle_time < ACTIVITY_IDLE_SECONDS + IDLE_CACHE_SECONDS:
+            idle_time = self.get_idle_time(max_age=0)
         
         # 如果空闲时间很短（小于2秒），认为有活动
-        if idle_time < 2.0:
-            current_time = time.time()
+        if idle_time < ACTIVITY_IDLE_SECONDS:
+            current_time = time.monotonic()
             if current_time - self.last_input_time > 1.0:  # 每秒最多发射一次信号
                 self.activity_detected.emit()
                 self.last_input_time = current_time
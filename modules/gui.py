@@ -8,13 +8,218 @@ from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                              QPushButton, QLabel, QLineEdit, QSpinBox, QCheckBox, 
                              QGroupBox, QFileDialog, QComboBox, QTimeEdit, QListWidget, 
                              QListWidgetItem, QProgressBar, QTabWidget, QGridLayout, 
-                             QFrame, QMessageBox, QApplication, QDesktopWidget,
-                             QTextEdit, QTextBrowser, QSplitter, QSizePolicy)
-from PyQt5.QtCore import Qt, QTime, QTimer, pyqtSignal, QDateTime
-from PyQt5.QtGui import QFont, QIcon, QTextCursor, QColor
+                             QFrame, QMessageBox, QApplication,
+                             QTextEdit, QTextBrowser, QPlainTextEdit, QSplitter, QSizePolicy)
+from PyQt5.QtCore import (Qt, QTime, QTimer, pyqtSignal, QDateTime, QEvent, QSignalBlocker,
+                          QObject, QThread, QFileSystemWatcher)
+from PyQt5.QtGui import (QFont, QIcon, QTextCursor, QTextCharFormat, QColor, QPalette,
+                         QGuiApplication)
 import psutil
 import json
 import os
+import bisect
+from collections import OrderedDict
+
+# 进程历史记录最多保留的条数
+MAX_PROCESS_HISTORY = 20
+
+# 日志级别前缀颜色
+LOG_LEVEL_COLORS = {
+    'INFO': '#1890ff',
+    'WARNING': '#faad14',
+    'ERROR': '#ff4d4f',
+}
+
+# 主窗口样式表（模块加载时构建一次）
+_STYLESHEET = """
+    QMainWindow {
+        background-color: #f0f2f5;
+    }
+    QGroupBox {
+        font: bold 10pt "Microsoft YaHei";
+        border: 1px solid #d9d9d9;
+        border-radius: 4px;
+        margin-top: 10px;
+        padding-top: 15px;
+    }
+    QGroupBox::title {
+        subcontrol-origin: margin;
+        left: 10px;
+        padding: 0 3px;
+    }
+    QPushButton {
+        background-color: #1890ff;
+        color: white;
+        border: none;
+        border-radius: 4px;
+        padding: 5px 10px;
+        min-height: 25px;
+    }
+    QPushButton:hover {
+        background-color: #40a9ff;
+    }
+    QPushButton:pressed {
+        background-color: #096dd9;
+    }
+    QPushButton:disabled {
+        background-color: #d9d9d9;
+        color: #8c8c8c;
+    }
+    QLineEdit, QSpinBox, QTimeEdit, QComboBox {
+        border: 1px solid #d9d9d9;
+        border-radius: 4px;
+        padding: 3px 5px;
+        min-height: 25px;
+    }
+    QListWidget {
+        border: 1px solid #d9d9d9;
+        border-radius: 4px;
+        background-color: white;
+    }
+    QProgressBar {
+        border: 1px solid #d9d9d9;
+        border-radius: 4px;
+        text-align: center;
+        background-color: white;
+    }
+    QProgressBar::chunk {
+        background-color: #52c41a;
+        border-radius: 3px;
+    }
+    #buffer_progress[level="warn"]::chunk {
+        background-color: #faad14;
+    }
+    QTabWidget::pane {
+        border: 1px solid #d9d9d9;
+        border-radius: 4px;
+        padding: 5px;
+        background-color: white;
+    }
+    QTabBar::tab {
+        padding: 5px 10px;
+        border: 1px solid #d9d9d9;
+        border-bottom: none;
+        border-top-left-radius: 4px;
+        border-top-right-radius: 4px;
+        margin-right: 2px;
+        background-color: #f5f5f5;
+    }
+    QTabBar::tab:selected {
+        background-color: white;
+        border-bottom: 1px solid white;
+        margin-bottom: -1px;
+    }
+    QTextBrowser, QTextEdit, QPlainTextEdit {
+        border: 1px solid #d9d9d9;
+        border-radius: 4px;
+        background-color: white;
+        font-family: 'Consolas', 'Microsoft YaHei', monospace;
+        font-size: 10pt;
+    }
+    #title_label {
+        color: #1890ff;
+        font-size: 18px;
+        font-weight: bold;
+    }
+    #status_label {
+        font-size: 14px;
+        font-weight: bold;
+        padding: 5px;
+        border-radius: 4px;
+        text-align: center;
+    }
+    #status_label[running="true"] {
+        background-color: #52c41a;
+        color: white;
+        border: 1px solid #73d13d;
+    }
+    #status_label[running="false"] {
+        background-color: #ff4d4f;
+        color: white;
+        border: 1px solid #ff7875;
+    }
+    #mode_label {
+        font-size: 14px;
+        font-weight: bold;
+        padding: 5px;
+        border-radius: 4px;
+        background-color: #1890ff;
+        color: white;
+        border: 1px solid #40a9ff;
+    }
+    #volume_label {
+        font-size: 12px;
+        font-weight: bold;
+        color: #8c8c8c;
+        padding: 5px;
+        border: 1px solid #d9d9d9;
+        border-radius: 4px;
+        background-color: white;
+    }
+    #help_title_label {
+        font-size: 16px;
+        font-weight: bold;
+        color: #1890ff;
+        padding: 10px;
+    }
+    #log_browser {
+        font-family: 'Consolas', 'Microsoft YaHei', monospace;
+        font-size: 10pt;
+    }
+    .process-valid {
+        color: #52c41a;
+        font-weight: bold;
+    }
+    .process-invalid {
+        color: #ff4d4f;
+        font-weight: bold;
+    }
+    .process-info {
+        color: #1890ff;
+        font-weight: bold;
+    }
+    #process_status_label {
+        color: #1890ff;
+        font-weight: bold;
+        padding: 5px;
+        border-radius: 4px;
+        background-color: #f0f2f5;
+    }
+    #process_status_label[state="ok"] {
+        color: #52c41a;
+        background-color: #f6ffed;
+    }
+    #process_status_label[state="warn"] {
+        color: #faad14;
+        background-color: #fffbe6;
+    }
+    #process_status_label[state="err"] {
+        color: #ff4d4f;
+        background-color: #fff2f0;
+    }
+"""
+
+class _ProcessScanWorker(QObject):
+    """在后台线程中遍历进程列表，避免psutil系统调用阻塞界面"""
+    
+    process_names_ready = pyqtSignal(object)  # 运行中进程名集合（小写）
+    
+    def scan(self):
+        """遍历进程列表并发射运行中进程名集合"""
+        names = set()
+        try:
+            for proc in psutil.process_iter(['name']):
+                try:
+                    name = proc.info['name']
+                except Exception:
+                    # 遍历过程中退出的进程直接跳过
+                    continue
+                if name:
+                    names.add(name.lower())
+        except Exception as e:
+            print(f"检查进程失败: {e}")
+        self.process_names_ready.emit(frozenset(names))
+
 
 class SmartBoardGUI(QMainWindow):
     """智能板书自动保存系统 - 最初版本UI界面"""
@@ -26,6 +231,7 @@ class SmartBoardGUI(QMainWindow):
     update_volume_estimate = pyqtSignal()  # 更新体积估计信号
     process_changed = pyqtSignal(str)  # 进程设置改变信号
     settings_changed = pyqtSignal(dict)  # 设置改变信号（新增）
+    process_scan_requested = pyqtSignal()  # 请求后台遍历进程列表
     
     def __init__(self, log_manager=None, process_history=None):
         super().__init__()
@@ -34,11 +240,17 @@ class SmartBoardGUI(QMainWindow):
         # 日志管理器
         self.log_manager = log_manager
         
-        # 进程历史记录
-        self.process_history = process_history if process_history is not None else []
+        # 进程历史记录（有序字典，键为进程名，按添加顺序排列）
+        self.process_history = OrderedDict.fromkeys(process_history or [])
         if not self.process_history:
             self.load_process_history()
         
+        # 历史记录变更后最多每2秒写一次文件
+        self._history_save_timer = QTimer(self)
+        self._history_save_timer.setSingleShot(True)
+        self._history_save_timer.setInterval(2000)
+        self._history_save_timer.timeout.connect(self.save_process_history)
+        
         # 设置窗口大小和居中
         self.resize(1000, 750)  # 增加高度以容纳日志页面
         self.center_window()
@@ -46,9 +258,44 @@ class SmartBoardGUI(QMainWindow):
         # 设置全局样式
         self.setup_styles()
         
+        # 设置缓存，相关控件变化时标记为失效
+        self._settings_cache = None
+        self._settings_dirty = True
+        
+        # 设置变更合并：第一次变更立即处理，300毫秒内的后续变更合并为一次
+        self._settings_debounce = QTimer(self)
+        self._settings_debounce.setSingleShot(True)
+        self._settings_debounce.setInterval(300)
+        self._settings_debounce.timeout.connect(self._apply_settings)
+        self._pending_process_text = None  # 待处理的进程输入文本
+        self._settings_pending = False  # 是否有待发射的设置变更
+        self._volume_pending = False  # 是否有待更新的体积估计
+        
+        # 运行中进程名（小写），由后台线程定期更新，界面只做集合查询
+        self._proc_name_cache = frozenset()
+        self._proc_names_ready = False  # 是否已收到第一次遍历结果
+        self._proc_scan_pending = False  # 是否有尚未返回的遍历请求
+        self._process_scan_thread = QThread(self)
+        self._process_scan_worker = _ProcessScanWorker()
+        self._process_scan_worker.moveToThread(self._process_scan_thread)
+        self._process_scan_thread.finished.connect(self._process_scan_worker.deleteLater)
+        self.process_scan_requested.connect(self._process_scan_worker.scan)
+        self._process_scan_worker.process_names_ready.connect(self.on_process_names_ready)
+        self._process_scan_thread.start()
+        
+        # 日志页面首次显示时才创建
+        self.log_browser = None
+        self.log_tab_widget = None
+        
+        # 已显示的说明文档修改时间，文档未修改时刷新不重新加载
+        self._help_mtime = None
+        
         # 初始化UI组件
         self.init_ui()
         
+        # 先连接缓存失效信号，保证其他槽函数读取设置时缓存已失效
+        self.connect_settings_cache()
+        
         # 连接信号
         self.connect_signals()
         
@@ -58,136 +305,42 @@ class SmartBoardGUI(QMainWindow):
         # 监控状态标志
         self.is_monitoring = False
         
-        # 日志更新定时器
-        self.log_timer = QTimer()
-        self.log_timer.timeout.connect(self.update_log_display)
-        self.log_timer.start(1000)  # 每秒更新一次日志
+        # 日志刷新合并定时器：收到日志更新后最多每300毫秒刷新一次显示
+        self.log_timer = QTimer(self)
+        self.log_timer.setSingleShot(True)
+        self.log_timer.setInterval(300)
+        self.log_timer.timeout.connect(self.on_log_timer)
+        if self.log_manager:
+            self.log_manager.log_updated.connect(self.schedule_log_refresh)
         
-        # 进程检测定时器
+        # 进程检测定时器（窗口显示时每2秒检查一次进程）
         self.process_check_timer = QTimer()
-        self.process_check_timer.timeout.connect(self.check_processes)
-        self.process_check_timer.start(2000)  # 每2秒检查一次进程
+        self.process_check_timer.setInterval(2000)
+        self.process_check_timer.timeout.connect(self.request_process_scan)
+        
+        # 截图统计等高频状态先暂存，最多每200毫秒一次性刷新到界面
+        self._pending_state = {}
+        self._state_timer = QTimer(self)
+        self._state_timer.setSingleShot(True)
+        self._state_timer.setInterval(200)
+        self._state_timer.timeout.connect(self.apply_pending_state)
+        
+        # 进程状态刷新合并定时器：连续输入或加载配置时只检查一次
+        self._process_refresh_timer = QTimer(self)
+        self._process_refresh_timer.setSingleShot(True)
+        self._process_refresh_timer.setInterval(300)
+        self._process_refresh_timer.timeout.connect(self.check_processes)
     
     def center_window(self):
         """将窗口居中显示"""
-        screen = QDesktopWidget().screenGeometry()
+        screen = QGuiApplication.primaryScreen().availableGeometry()
         size = self.geometry()
         self.move((screen.width() - size.width()) // 2, 
                   (screen.height() - size.height()) // 6)
     
     def setup_styles(self):
         """设置应用程序样式"""
-        self.setStyleSheet("""
-            QMainWindow {
-                background-color: #f0f2f5;
-            }
-            QGroupBox {
-                font: bold 10pt "Microsoft YaHei";
-                border: 1px solid #d9d9d9;
-                border-radius: 4px;
-                margin-top: 10px;
-                padding-top: 15px;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 3px;
-            }
-            QPushButton {
-                background-color: #1890ff;
-                color: white;
-                border: none;
-                border-radius: 4px;
-                padding: 5px 10px;
-                min-height: 25px;
-            }
-            QPushButton:hover {
-                background-color: #40a9ff;
-            }
-            QPushButton:pressed {
-                background-color: #096dd9;
-            }
-            QPushButton:disabled {
-                background-color: #d9d9d9;
-                color: #8c8c8c;
-            }
-            QLineEdit, QSpinBox, QTimeEdit, QComboBox {
-                border: 1px solid #d9d9d9;
-                border-radius: 4px;
-                padding: 3px 5px;
-                min-height: 25px;
-            }
-            QListWidget {
-                border: 1px solid #d9d9d9;
-                border-radius: 4px;
-                background-color: white;
-            }
-            QProgressBar {
-                border: 1px solid #d9d9d9;
-                border-radius: 4px;
-                text-align: center;
-                background-color: white;
-            }
-            QProgressBar::chunk {
-                background-color: #52c41a;
-                border-radius: 3px;
-            }
-            QTabWidget::pane {
-                border: 1px solid #d9d9d9;
-                border-radius: 4px;
-                padding: 5px;
-                background-color: white;
-            }
-            QTabBar::tab {
-                padding: 5px 10px;
-                border: 1px solid #d9d9d9;
-                border-bottom: none;
-                border-top-left-radius: 4px;
-                border-top-right-radius: 4px;
-                margin-right: 2px;
-                background-color: #f5f5f5;
-            }
-            QTabBar::tab:selected {
-                background-color: white;
-                border-bottom: 1px solid white;
-                margin-bottom: -1px;
-            }
-            QTextBrowser, QTextEdit {
-                border: 1px solid #d9d9d9;
-                border-radius: 4px;
-                background-color: white;
-                font-family: 'Consolas', 'Microsoft YaHei', monospace;
-                font-size: 10pt;
-            }
-            #title_label {
-                color: #1890ff;
-                font-size: 18px;
-                font-weight: bold;
-            }
-            #status_label {
-                font-size: 14px;
-                font-weight: bold;
-                padding: 5px;
-                border-radius: 4px;
-                text-align: center;
-            }
-            #log_browser {
-                font-family: 'Consolas', 'Microsoft YaHei', monospace;
-                font-size: 10pt;
-            }
-            .process-valid {
-                color: #52c41a;
-                font-weight: bold;
-            }
-            .process-invalid {
-                color: #ff4d4f;
-                font-weight: bold;
-            }
-            .process-info {
-                color: #1890ff;
-                font-weight: bold;
-            }
-        """)
+        self.setStyleSheet(_STYLESHEET)
     
     def load_process_history(self):
         """加载进程历史记录"""
@@ -195,17 +348,23 @@ class SmartBoardGUI(QMainWindow):
             config_file = "process_history.json"
             if os.path.exists(config_file):
                 with open(config_file, 'r', encoding='utf-8') as f:
-                    self.process_history = json.load(f)
+                    self.process_history = OrderedDict.fromkeys(json.load(f))
         except Exception as e:
             print(f"加载进程历史记录失败: {e}")
-            self.process_history = []
+            self.process_history = OrderedDict()
     
     def save_process_history(self):
         """保存进程历史记录"""
+        self._history_save_timer.stop()
         try:
             config_file = "process_history.json"
-            with open(config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.process_history, f, ensure_ascii=False, indent=2)
+            # 一次序列化后整块写入临时文件，再原子替换，避免写到一半的文件
+            data = json.dumps(list(self.process_history), ensure_ascii=False,
+                              separators=(',', ':')).encode('utf-8')
+            tmp_file = config_file + ".tmp"
+            with open(tmp_file, 'wb', buffering=len(data) + 1) as f:
+                f.write(data)
+            os.replace(tmp_file, config_file)
         except Exception as e:
             print(f"保存进程历史记录失败: {e}")
     
@@ -213,19 +372,34 @@ class SmartBoardGUI(QMainWindow):
         """添加到进程历史记录"""
         process_name = process_name.strip()
         if process_name and process_name not in self.process_history:
-            self.process_history.append(process_name)
+            self.process_history[process_name] = None
             # 只保留最近20个记录
-            if len(self.process_history) > 20:
-                self.process_history = self.process_history[-20:]
-            self.save_process_history()
+            if len(self.process_history) > MAX_PROCESS_HISTORY:
+                self.process_history.popitem(last=False)
+            # 延迟写入文件，短时间内的多次添加只写一次
+            if not self._history_save_timer.isActive():
+                self._history_save_timer.start()
             self.update_process_history_list()
     
+    def flush_process_history(self):
+        """立即写入尚未保存的进程历史记录"""
+        if self._history_save_timer.isActive():
+            self.save_process_history()
+    
     def update_process_history_list(self):
         """更新进程历史记录列表"""
-        if hasattr(self, 'history_list'):
-            self.history_list.clear()
-            for process in self.process_history:
-                self.history_list.addItem(process)
+        self.set_list_items(self.history_list, self.process_history)
+    
+    def set_list_items(self, list_widget, items):
+        """一次性替换列表控件的全部条目（只触发一次插入和重绘）"""
+        blocker = QSignalBlocker(list_widget)
+        list_widget.setUpdatesEnabled(False)
+        try:
+            list_widget.clear()
+            list_widget.addItems(list(items))
+        finally:
+            list_widget.setUpdatesEnabled(True)
+            blocker.unblock()
     
     def init_ui(self):
         """初始化用户界面"""
@@ -272,56 +446,31 @@ class SmartBoardGUI(QMainWindow):
         self.status_label = QLabel("已停止")
         self.status_label.setObjectName("status_label")
         self.status_label.setAlignment(Qt.AlignCenter)
-        self.status_label.setStyleSheet("""
-            QLabel {
-                background-color: #ff4d4f;
-                color: white;
-                border: 1px solid #ff7875;
-            }
-        """)
+        self.status_label.setProperty("running", "false")
         layout1.addWidget(self.status_label)
         
         # 截图模式
         status_card2 = QGroupBox("截图模式")
         layout2 = QVBoxLayout(status_card2)
         self.activity_label = QLabel("固定间隔")
-        self.activity_label.setObjectName("status_label")
+        self.activity_label.setObjectName("mode_label")
         self.activity_label.setAlignment(Qt.AlignCenter)
-        self.activity_label.setStyleSheet("""
-            QLabel {
-                background-color: #1890ff;
-                color: white;
-                border: 1px solid #40a9ff;
-            }
-        """)
         layout2.addWidget(self.activity_label)
         
         # 截图统计
         status_card3 = QGroupBox("截图统计")
         layout3 = QVBoxLayout(status_card3)
         self.capture_count_label = QLabel("0")
+        self.set_label_palette(self.capture_count_label, "#1890ff", pixel_size=24, bold=True)
         self.capture_count_label.setAlignment(Qt.AlignCenter)
-        self.capture_count_label.setStyleSheet("""
-            QLabel {
-                font-size: 24px;
-                font-weight: bold;
-                color: #1890ff;
-            }
-        """)
         layout3.addWidget(self.capture_count_label)
         
         # 缓冲区状态
         status_card4 = QGroupBox("缓冲区")
         layout4 = QVBoxLayout(status_card4)
         self.buffer_label = QLabel("0/100")
+        self.set_label_palette(self.buffer_label, "#52c41a", pixel_size=20, bold=True)
         self.buffer_label.setAlignment(Qt.AlignCenter)
-        self.buffer_label.setStyleSheet("""
-            QLabel {
-                font-size: 20px;
-                font-weight: bold;
-                color: #52c41a;
-            }
-        """)
         layout4.addWidget(self.buffer_label)
         
         status_grid.addWidget(status_card1, 0, 0)
@@ -331,6 +480,18 @@ class SmartBoardGUI(QMainWindow):
         
         parent_layout.addLayout(status_grid)
     
+    def set_label_palette(self, label, color, pixel_size=None, bold=False):
+        """用调色板和字体设置单色标签的样式（不经过样式表解析）"""
+        palette = label.palette()
+        palette.setColor(QPalette.WindowText, QColor(color))
+        label.setPalette(palette)
+        if pixel_size is not None or bold:
+            font = label.font()
+            if pixel_size is not None:
+                font.setPixelSize(pixel_size)
+            font.setBold(bold)
+            label.setFont(font)
+    
     def create_control_section(self, parent_layout):
         """创建控制按钮区域"""
         control_frame = QFrame()
@@ -349,6 +510,8 @@ class SmartBoardGUI(QMainWindow):
         
         # 缓冲区进度条
         self.buffer_progress = QProgressBar()
+        self.buffer_progress.setObjectName("buffer_progress")
+        self.buffer_progress.setProperty("level", "ok")
         self.buffer_progress.setRange(0, 100)
         self.buffer_progress.setValue(0)
         self.buffer_progress.setFormat("缓冲区使用率: %p%")
@@ -356,18 +519,8 @@ class SmartBoardGUI(QMainWindow):
         
         # 体积估计标签
         self.volume_estimate_label = QLabel("估计体积: 0.0 MB")
+        self.volume_estimate_label.setObjectName("volume_label")
         self.volume_estimate_label.setAlignment(Qt.AlignCenter)
-        self.volume_estimate_label.setStyleSheet("""
-            QLabel {
-                font-size: 12px;
-                font-weight: bold;
-                color: #8c8c8c;
-                padding: 5px;
-                border: 1px solid #d9d9d9;
-                border-radius: 4px;
-                background-color: white;
-            }
-        """)
         
         control_layout.addWidget(self.start_btn, 1)
         control_layout.addWidget(self.stop_btn, 1)
@@ -389,18 +542,39 @@ class SmartBoardGUI(QMainWindow):
         # 系统设置选项卡
         self.create_system_settings_tab()
         
-        # 日志页面选项卡
-        self.create_log_tab()
-        
-        # 程序说明页面
-        self.create_help_tab()
+        # 日志页面和程序说明页面在首次切换到时才创建
+        self._lazy_tabs = {}  # 选项卡索引 -> (创建函数, 标题)
+        self.add_lazy_tab(self.create_log_tab, "📝 运行日志")
+        self.add_lazy_tab(self.create_help_tab, "📘 程序说明")
+        self.settings_tabs.currentChanged.connect(self.on_settings_tab_changed)
         
         parent_layout.addWidget(self.settings_tabs)
     
+    def add_lazy_tab(self, builder, title):
+        """添加延迟创建的选项卡，先放置空白占位页面"""
+        index = self.settings_tabs.addTab(QWidget(), title)
+        self._lazy_tabs[index] = (builder, title)
+    
+    def on_settings_tab_changed(self, index):
+        """首次切换到延迟创建的选项卡时，用真正的页面替换占位页面"""
+        lazy_tab = self._lazy_tabs.pop(index, None)
+        if lazy_tab is None:
+            # 切换回已创建的日志页面时立即补上隐藏期间的日志
+            if self.settings_tabs.widget(index) is self.log_tab_widget:
+                self.update_log_display()
+            return
+        
+        builder, title = lazy_tab
+        placeholder = self.settings_tabs.widget(index)
+        self.settings_tabs.blockSignals(True)
+        self.settings_tabs.removeTab(index)
+        self.settings_tabs.insertTab(index, builder(), title)
+        self.settings_tabs.setCurrentIndex(index)
+        self.settings_tabs.blockSignals(False)
+        placeholder.deleteLater()
+    
     def create_basic_settings_tab(self):
         """创建基本设置选项卡"""
-        from PyQt5.QtWidgets import QWidget, QVBoxLayout, QGroupBox, QHBoxLayout, QLabel
-        
         basic_tab = QWidget()
         layout = QVBoxLayout(basic_tab)
         layout.setSpacing(15)
@@ -442,13 +616,30 @@ class SmartBoardGUI(QMainWindow):
         buffer_layout.addStretch()
         layout.addWidget(buffer_group)
         
+        # 图片格式设置
+        format_group = QGroupBox("图片格式设置")
+        format_layout = QHBoxLayout(format_group)
+        self.format_combo = QComboBox()
+        self.format_combo.addItem("JPG", "jpg")
+        self.format_combo.addItem("WEBP", "webp")
+        self.format_combo.addItem("PNG（无损）", "png")
+        self.format_combo.setMaximumWidth(150)
+        self.quality_spin = QSpinBox()
+        self.quality_spin.setRange(1, 100)
+        self.quality_spin.setValue(85)
+        self.quality_spin.setMaximumWidth(100)
+        format_layout.addWidget(QLabel("保存格式:"))
+        format_layout.addWidget(self.format_combo)
+        format_layout.addWidget(QLabel("图片质量:"))
+        format_layout.addWidget(self.quality_spin)
+        format_layout.addStretch()
+        layout.addWidget(format_group)
+        
         layout.addStretch()
         self.settings_tabs.addTab(basic_tab, "⚙ 基本设置")
     
     def create_advanced_settings_tab(self):
         """创建高级设置选项卡"""
-        from PyQt5.QtWidgets import QWidget, QVBoxLayout, QGroupBox, QHBoxLayout, QLabel, QListWidget
-        
         advanced_tab = QWidget()
         layout = QVBoxLayout(advanced_tab)
         layout.setSpacing(15)
@@ -477,16 +668,9 @@ class SmartBoardGUI(QMainWindow):
         
         # 进程状态提示
         self.process_status_label = QLabel("未设置进程，将监控整个显示器")
+        self.process_status_label.setObjectName("process_status_label")
+        self.process_status_label.setProperty("state", "info")
         self.process_status_label.setWordWrap(True)
-        self.process_status_label.setStyleSheet("""
-            QLabel {
-                color: #1890ff;
-                font-weight: bold;
-                padding: 5px;
-                border-radius: 4px;
-                background-color: #f0f2f5;
-            }
-        """)
         window_layout.addWidget(self.process_status_label)
         
         # 进程历史记录
@@ -495,6 +679,7 @@ class SmartBoardGUI(QMainWindow):
         
         self.history_list = QListWidget()
         self.history_list.setMaximumHeight(120)
+        self.history_list.setUniformItemSizes(True)  # 条目均为单行文本，布局时不逐条计算尺寸
         history_layout.addWidget(self.history_list)
         
         # 更新历史记录列表
@@ -531,12 +716,12 @@ class SmartBoardGUI(QMainWindow):
         
         self.time_list = QListWidget()
         self.time_list.setMaximumHeight(120)
+        self.time_list.setUniformItemSizes(True)  # 条目均为单行文本，布局时不逐条计算尺寸
         time_layout.addWidget(self.time_list)
         
         # 初始化默认时间
         default_times = ["09:00", "12:00", "15:00", "18:00"]
-        for time_str in default_times:
-            self.time_list.addItem(time_str)
+        self.set_save_times(default_times)
         
         layout.addWidget(time_group)
         
@@ -545,8 +730,6 @@ class SmartBoardGUI(QMainWindow):
     
     def create_system_settings_tab(self):
         """创建系统设置选项卡"""
-        from PyQt5.QtWidgets import QWidget, QVBoxLayout, QGroupBox, QLabel
-        
         system_tab = QWidget()
         layout = QVBoxLayout(system_tab)
         layout.setSpacing(15)
@@ -568,7 +751,7 @@ class SmartBoardGUI(QMainWindow):
         # 提示信息
         info_label = QLabel("注意：开机自启动需要管理员权限，首次设置时可能会弹出UAC确认窗口。")
         info_label.setWordWrap(True)
-        info_label.setStyleSheet("color: #ff4d4f; font-size: 12px;")
+        self.set_label_palette(info_label, "#ff4d4f", pixel_size=12)
         startup_layout.addWidget(info_label)
         
         layout.addWidget(startup_group)
@@ -587,10 +770,9 @@ class SmartBoardGUI(QMainWindow):
         self.settings_tabs.addTab(system_tab, "🖥️ 系统设置")
     
     def create_log_tab(self):
-        """创建日志页面"""
-        from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTextBrowser
-        
+        """创建日志页面，返回页面控件"""
         log_tab = QWidget()
+        self.log_tab_widget = log_tab
         layout = QVBoxLayout(log_tab)
         layout.setSpacing(10)
         
@@ -606,35 +788,44 @@ class SmartBoardGUI(QMainWindow):
         log_control_layout.addWidget(self.refresh_log_btn)
         log_control_layout.addStretch()
         
-        # 日志显示区域
-        self.log_browser = QTextBrowser()
+        # 日志显示区域（纯文本，超过1000行时自动删除最早的行）
+        self.log_browser = QPlainTextEdit()
         self.log_browser.setObjectName("log_browser")
         self.log_browser.setReadOnly(True)
+        self.log_browser.setMaximumBlockCount(1000)
         self.log_browser.setMinimumHeight(300)
+        self._log_seq = 0  # 已显示到的日志序号
+        
+        # 追加日志用的光标和各级别前缀的字符格式（只创建一次）
+        self._log_cursor = QTextCursor(self.log_browser.document())
+        self._log_plain_format = QTextCharFormat()
+        self._log_level_formats = {}
+        for level, color in LOG_LEVEL_COLORS.items():
+            level_format = QTextCharFormat()
+            level_format.setForeground(QColor(color))
+            level_format.setFontWeight(QFont.Bold)
+            self._log_level_formats[level] = level_format
         
         layout.addLayout(log_control_layout)
         layout.addWidget(self.log_browser)
         
-        self.settings_tabs.addTab(log_tab, "📝 运行日志")
+        self.clear_log_btn.clicked.connect(self.clear_log)
+        self.save_log_btn.clicked.connect(self.save_log)
+        self.refresh_log_btn.clicked.connect(self.reload_log_display)
+        
+        # 显示已有的日志
+        self.update_log_display()
+        return log_tab
     
     def create_help_tab(self):
-        """创建程序说明页面"""
-        from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QTextBrowser, QPushButton, QHBoxLayout
-        
+        """创建程序说明页面，返回页面控件"""
         help_tab = QWidget()
         layout = QVBoxLayout(help_tab)
         layout.setSpacing(15)
         
         # 标题
         title_label = QLabel("📘 智能板书监控系统 - 使用说明")
-        title_label.setStyleSheet("""
-            QLabel {
-                font-size: 16px;
-                font-weight: bold;
-                color: #1890ff;
-                padding: 10px;
-            }
-        """)
+        title_label.setObjectName("help_title_label")
         layout.addWidget(title_label)
         
         # 说明文本区域
@@ -645,18 +836,27 @@ class SmartBoardGUI(QMainWindow):
         # 加载说明文档
         self.load_help_content()
         
-        # 刷新按钮
-        refresh_btn = QPushButton("刷新说明文档")
-        refresh_btn.setMaximumWidth(120)
-        
-        btn_layout = QHBoxLayout()
-        btn_layout.addStretch()
-        btn_layout.addWidget(refresh_btn)
-        
         layout.addWidget(self.help_browser)
-        layout.addLayout(btn_layout)
         
-        self.settings_tabs.addTab(help_tab, "📘 程序说明")
+        # 监视说明文档（及其所在目录，以便发现新建或被替换的文件），修改后自动重新加载
+        self._help_watcher = QFileSystemWatcher(self)
+        self._help_watcher.addPath(os.path.abspath("."))
+        self.watch_help_file()
+        self._help_watcher.fileChanged.connect(self.on_help_file_changed)
+        self._help_watcher.directoryChanged.connect(self.on_help_file_changed)
+        return help_tab
+    
+    def watch_help_file(self):
+        """说明文档存在且尚未被监视时加入监视列表"""
+        help_path = os.path.abspath("HELP.md")
+        if os.path.exists(help_path) and help_path not in self._help_watcher.files():
+            self._help_watcher.addPath(help_path)
+    
+    def on_help_file_changed(self, path):
+        """说明文档或其所在目录发生变化"""
+        # 编辑器保存时可能先删除再新建文件，此时需要重新监视
+        self.watch_help_file()
+        self.load_help_content()
     
     def load_help_content(self):
         """加载说明文档"""
@@ -700,37 +900,46 @@ class SmartBoardGUI(QMainWindow):
         """
         
         try:
-            if os.path.exists(help_file):
+            try:
+                mtime = os.stat(help_file).st_mtime_ns
+            except FileNotFoundError:
+                mtime = None
+            
+            # 文档未修改时不再重新读取和解析
+            if self._help_mtime is not None and self._help_mtime == (mtime,):
+                return
+            
+            if mtime is not None:
                 with open(help_file, 'r', encoding='utf-8') as f:
                     help_text = f.read()
                 if not help_text.strip().startswith('<'):
                     help_text = f"<pre>{help_text}</pre>"
             else:
                 help_text = default_content
+            self._help_mtime = (mtime,)
         except Exception as e:
             help_text = f"<p style='color: red'>加载说明文档失败: {str(e)}</p>" + default_content
+            self._help_mtime = None
         
         self.help_browser.setHtml(help_text)
     
     def create_status_bar(self, parent_layout):
         """创建状态栏"""
-        from PyQt5.QtWidgets import QFrame, QHBoxLayout, QLabel
-        
         status_frame = QFrame()
         status_layout = QHBoxLayout(status_frame)
         status_layout.setContentsMargins(10, 5, 10, 5)
         
         self.system_info_label = QLabel("系统就绪")
-        self.system_info_label.setStyleSheet("color: #595959;")
+        self.set_label_palette(self.system_info_label, "#595959")
         
         self.last_capture_label = QLabel("最后截图: 无")
-        self.last_capture_label.setStyleSheet("color: #595959;")
+        self.set_label_palette(self.last_capture_label, "#595959")
         
         self.monitor_target_label = QLabel("监控目标: 整个显示器")
-        self.monitor_target_label.setStyleSheet("color: #1890ff; font-weight: bold;")
+        self.set_label_palette(self.monitor_target_label, "#1890ff", bold=True)
         
         self.memory_usage_label = QLabel("内存使用: --")
-        self.memory_usage_label.setStyleSheet("color: #595959;")
+        self.set_label_palette(self.memory_usage_label, "#595959")
         
         status_layout.addWidget(self.system_info_label)
         status_layout.addStretch()
@@ -742,6 +951,30 @@ class SmartBoardGUI(QMainWindow):
         
         parent_layout.addWidget(status_frame)
     
+    def connect_settings_cache(self):
+        """参与设置的控件变化时使设置缓存失效"""
+        self.path_edit.textChanged.connect(self.invalidate_settings_cache)
+        self.interval_spin.valueChanged.connect(self.invalidate_settings_cache)
+        self.buffer_size_spin.valueChanged.connect(self.invalidate_settings_cache)
+        self.format_combo.currentIndexChanged.connect(self.invalidate_settings_cache)
+        self.quality_spin.valueChanged.connect(self.invalidate_settings_cache)
+        self.foreground_check.stateChanged.connect(self.invalidate_settings_cache)
+        self.process_edit.textChanged.connect(self.invalidate_settings_cache)
+        self.ink_check.stateChanged.connect(self.invalidate_settings_cache)
+        self.auto_start_check.stateChanged.connect(self.invalidate_settings_cache)
+        self.silent_start_check.stateChanged.connect(self.invalidate_settings_cache)
+        self.minimize_to_tray_check.stateChanged.connect(self.invalidate_settings_cache)
+        
+        time_model = self.time_list.model()
+        time_model.rowsInserted.connect(self.invalidate_settings_cache)
+        time_model.rowsRemoved.connect(self.invalidate_settings_cache)
+        time_model.dataChanged.connect(self.invalidate_settings_cache)
+        time_model.modelReset.connect(self.invalidate_settings_cache)
+    
+    def invalidate_settings_cache(self, *args):
+        """标记设置缓存失效"""
+        self._settings_dirty = True
+    
     def connect_signals(self):
         """连接信号和槽"""
         self.start_btn.clicked.connect(self.on_start_clicked)
@@ -751,17 +984,13 @@ class SmartBoardGUI(QMainWindow):
         self.remove_time_btn.clicked.connect(self.on_remove_time_clicked)
         self.process_changed.connect(self.update_monitor_target)
         self.add_history_btn.clicked.connect(self.on_add_to_history)
-        if hasattr(self, 'history_list'):
-            self.history_list.itemClicked.connect(self.on_history_item_clicked)
-        if hasattr(self, 'clear_log_btn'):
-            self.clear_log_btn.clicked.connect(self.clear_log)
-        if hasattr(self, 'save_log_btn'):
-            self.save_log_btn.clicked.connect(self.save_log)
-        if hasattr(self, 'refresh_log_btn'):
-            self.refresh_log_btn.clicked.connect(self.update_log_display)
+        self.history_list.itemClicked.connect(self.on_history_item_clicked)
         
         # 实时设置变更连接
         self.interval_spin.valueChanged.connect(self.on_settings_changed)
+        self.buffer_size_spin.valueChanged.connect(self.on_buffer_size_changed)
+        self.format_combo.currentIndexChanged.connect(self.on_format_changed)
+        self.quality_spin.valueChanged.connect(self.on_settings_changed)
         self.foreground_check.stateChanged.connect(self.on_settings_changed)
         self.ink_check.stateChanged.connect(self.on_settings_changed)
         self.process_edit.textChanged.connect(self.on_process_text_changed)
@@ -769,6 +998,17 @@ class SmartBoardGUI(QMainWindow):
         self.silent_start_check.stateChanged.connect(self.on_silent_start_changed)
         self.minimize_to_tray_check.stateChanged.connect(self.on_minimize_to_tray_changed)
     
+    def on_format_changed(self, index):
+        """图片格式改变（PNG为无损格式，不使用质量设置）"""
+        self.quality_spin.setEnabled(self.format_combo.currentData() != 'png')
+        self.on_settings_changed()
+    
+    def set_image_format(self, image_format):
+        """选中指定的图片格式，不支持的格式保持当前选择"""
+        index = self.format_combo.findData(str(image_format).lower())
+        if index >= 0:
+            self.format_combo.setCurrentIndex(index)
+    
     def on_foreground_changed(self, state):
         """前台窗口检测状态改变"""
         is_enabled = (state == Qt.Checked)
@@ -779,9 +1019,10 @@ class SmartBoardGUI(QMainWindow):
         self.update_monitor_target(self.process_edit.text())
     
     def on_process_text_changed(self, text):
-        """进程输入文本改变"""
-        self.process_changed.emit(text)
-        self.check_processes()
+        """进程输入文本改变（合并连续输入）"""
+        self._pending_process_text = text
+        self._schedule_settings()
+        self.schedule_process_check()
     
     def on_add_to_history(self):
         """添加到历史记录"""
@@ -802,87 +1043,85 @@ class SmartBoardGUI(QMainWindow):
         process_text = self.process_edit.text().strip()
         if not process_text:
             self.process_status_label.setText("未设置进程，将监控整个显示器")
-            self.process_status_label.setStyleSheet("""
-                QLabel {
-                    color: #1890ff;
-                    font-weight: bold;
-                    padding: 5px;
-                    border-radius: 4px;
-                    background-color: #f0f2f5;
-                }
-            """)
+            self.set_process_status_state("info")
+            return
+        
+        # 还没有进程列表时先请求遍历，结果返回后会再次检查
+        if not self._proc_names_ready:
+            self.request_process_scan()
             return
         
         # 分割进程名
         process_names = [name.strip() for name in process_text.split(',') if name.strip()]
         
-        existing_processes = []
-        missing_processes = []
-        
-        for process_name in process_names:
-            if self.is_process_running(process_name):
-                existing_processes.append(process_name)
-            else:
-                missing_processes.append(process_name)
+        existing_processes, missing_processes = self.check_processes_batch(process_names)
         
         if not existing_processes and missing_processes:
             # 所有进程都不存在
             self.process_status_label.setText(f"进程不存在: {', '.join(missing_processes)}")
-            self.process_status_label.setStyleSheet("""
-                QLabel {
-                    color: #ff4d4f;
-                    font-weight: bold;
-                    padding: 5px;
-                    border-radius: 4px;
-                    background-color: #fff2f0;
-                }
-            """)
+            self.set_process_status_state("err")
         elif existing_processes and not missing_processes:
             # 所有进程都存在
             self.process_status_label.setText(f"进程存在: {', '.join(existing_processes)}")
-            self.process_status_label.setStyleSheet("""
-                QLabel {
-                    color: #52c41a;
-                    font-weight: bold;
-                    padding: 5px;
-                    border-radius: 4px;
-                    background-color: #f6ffed;
-                }
-            """)
+            self.set_process_status_state("ok")
         else:
             # 部分存在
             status_text = f"存在: {', '.join(existing_processes)}"
             if missing_processes:
                 status_text += f" | 不存在: {', '.join(missing_processes)}"
             self.process_status_label.setText(status_text)
-            self.process_status_label.setStyleSheet("""
-                QLabel {
-                    color: #faad14;
-                    font-weight: bold;
-                    padding: 5px;
-                    border-radius: 4px;
-                    background-color: #fffbe6;
-                }
-            """)
+            self.set_process_status_state("warn")
+    
+    def set_process_status_state(self, state):
+        """切换进程状态提示的样式（由全局样式表中的state属性选择器决定）"""
+        label = self.process_status_label
+        if label.property("state") == state:
+            return
+        label.setProperty("state", state)
+        label.style().unpolish(label)
+        label.style().polish(label)
+    
+    def request_process_scan(self):
+        """请求后台线程遍历一次进程列表（上一次请求未返回时不重复请求）"""
+        if not self._proc_scan_pending:
+            self._proc_scan_pending = True
+            self.process_scan_requested.emit()
+    
+    def on_process_names_ready(self, names):
+        """收到后台线程的进程名集合后刷新进程状态"""
+        self._proc_name_cache = names
+        self._proc_names_ready = True
+        self._proc_scan_pending = False
+        self.check_processes()
+    
+    def stop_process_scan(self):
+        """停止后台进程遍历线程"""
+        self.process_check_timer.stop()
+        self._process_scan_thread.quit()
+        self._process_scan_thread.wait(1000)
+    
+    def check_processes_batch(self, process_names):
+        """一次性检查多个进程，返回 (存在的进程列表, 不存在的进程列表)"""
+        running = self._proc_name_cache
+        existing_processes = []
+        missing_processes = []
+        for process_name in process_names:
+            target = process_name.lower()
+            if not target.endswith('.exe'):
+                target = f"{target}.exe"
+            if target in running:
+                existing_processes.append(process_name)
+            else:
+                missing_processes.append(process_name)
+        return existing_processes, missing_processes
     
     def is_process_running(self, process_name):
         """检查进程是否在运行"""
-        try:
-            # 确保进程名有.exe后缀
-            if not process_name.lower().endswith('.exe'):
-                process_name = f"{process_name}.exe"
-            
-            process_name = process_name.lower()
-            for proc in psutil.process_iter(['name']):
-                try:
-                    if proc.info['name'] and proc.info['name'].lower() == process_name:
-                        return True
-                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                    pass
-            return False
-        except Exception as e:
-            print(f"检查进程失败: {e}")
-            return False
+        # 确保进程名有.exe后缀
+        process_name = process_name.lower()
+        if not process_name.endswith('.exe'):
+            process_name = f"{process_name}.exe"
+        return process_name in self._proc_name_cache
     
     def update_monitor_target(self, process_text):
         """更新监控目标显示"""
@@ -897,13 +1136,13 @@ class SmartBoardGUI(QMainWindow):
                 self.monitor_target_label.setText(f"监控目标: {len(process_names)}个进程")
     
     def on_interval_changed(self, value):
-        """截图间隔改变"""
-        self.update_volume_estimate.emit()
+        """截图间隔改变（体积估计只与缓冲区大小有关，无需更新）"""
         self.on_settings_changed()
     
     def on_buffer_size_changed(self, value):
-        """缓冲区大小改变"""
-        self.update_volume_estimate.emit()
+        """缓冲区大小改变（连续调整时合并为一次体积估计更新）"""
+        self._volume_pending = True
+        self._schedule_settings()
     
     def on_auto_start_changed(self, state):
         """开机自启动设置改变"""
@@ -924,13 +1163,7 @@ class SmartBoardGUI(QMainWindow):
         self.start_btn.setEnabled(False)
         self.stop_btn.setEnabled(True)
         self.status_label.setText("运行中")
-        self.status_label.setStyleSheet("""
-            QLabel {
-                background-color: #52c41a;
-                color: white;
-                border: 1px solid #73d13d;
-            }
-        """)
+        self.set_status_running(True)
         self.is_monitoring = True
         self.start_monitor_signal.emit()
         
@@ -943,16 +1176,20 @@ class SmartBoardGUI(QMainWindow):
         self.start_btn.setEnabled(True)
         self.stop_btn.setEnabled(False)
         self.status_label.setText("已停止")
-        self.status_label.setStyleSheet("""
-            QLabel {
-                background-color: #ff4d4f;
-                color: white;
-                border: 1px solid #ff7875;
-            }
-        """)
+        self.set_status_running(False)
         self.is_monitoring = False
         self.stop_monitor_signal.emit()
     
+    def set_status_running(self, running):
+        """切换监控状态标签的运行/停止样式（由全局样式表中的running属性选择器决定）"""
+        value = "true" if running else "false"
+        label = self.status_label
+        if label.property("running") == value:
+            return
+        label.setProperty("running", value)
+        label.style().unpolish(label)
+        label.style().polish(label)
+    
     def on_browse_clicked(self):
         """浏览按钮点击事件"""
         path = QFileDialog.getExistingDirectory(self, "选择保存目录")
@@ -964,48 +1201,73 @@ class SmartBoardGUI(QMainWindow):
         time_str = self.time_edit.time().toString("HH:mm")
         
         # 检查是否已存在
-        for i in range(self.time_list.count()):
-            if self.time_list.item(i).text() == time_str:
-                return
-        
-        # 添加新时间点
-        self.time_list.addItem(time_str)
+        if time_str in self._time_set:
+            return
         
-        # 按时间排序
-        self.sort_time_list()
+        # "HH:mm"字符串的字典序即时间顺序，二分查找排序位置插入新时间点
+        index = bisect.bisect_left(self._times_sorted, time_str)
+        self._time_set.add(time_str)
+        self._times_sorted.insert(index, time_str)
+        self.time_list.insertItem(index, time_str)
+        self.on_settings_changed()
     
     def on_remove_time_clicked(self):
         """移除时间点按钮点击事件"""
         current_row = self.time_list.currentRow()
         if current_row >= 0:
             self.time_list.takeItem(current_row)
+            self._time_set.discard(self._times_sorted.pop(current_row))
+            self.on_settings_changed()
     
-    def sort_time_list(self):
-        """对时间列表进行排序"""
-        items = []
-        for i in range(self.time_list.count()):
-            items.append(self.time_list.item(i).text())
-        
-        items.sort()
-        self.time_list.clear()
-        for item in items:
-            self.time_list.addItem(item)
+    def set_save_times(self, save_times):
+        """设置保存时间点列表（去重后按时间排序显示）"""
+        self._time_set = set(save_times)
+        self._times_sorted = sorted(self._time_set)
+        self.set_list_items(self.time_list, self._times_sorted)
     
     def on_settings_changed(self):
-        """设置变更处理函数"""
-        # 收集所有设置
-        settings = self.get_settings()
-        # 发射设置变更信号
-        self.settings_changed.emit(settings)
+        """设置变更处理函数（合并连续变更）"""
+        self._settings_pending = True
+        self._schedule_settings()
+    
+    def _schedule_settings(self):
+        """空闲时立即处理变更，合并窗口内的变更推迟到窗口结束时处理"""
+        if self._settings_debounce.isActive():
+            self._settings_debounce.start()
+        else:
+            self._apply_settings()
+            self._settings_debounce.start()
+    
+    def _apply_settings(self):
+        """处理待处理的进程输入、设置变更和体积估计更新"""
+        if self._pending_process_text is not None:
+            text = self._pending_process_text
+            self._pending_process_text = None
+            self.process_changed.emit(text)
+        
+        if self._settings_pending:
+            self._settings_pending = False
+            # 收集所有设置并发射设置变更信号
+            self.settings_changed.emit(self.get_settings())
+        
+        if self._volume_pending:
+            self._volume_pending = False
+            self.update_volume_estimate.emit()
     
     def get_settings(self):
-        """获取所有设置"""
+        """获取所有设置（控件未变化时返回缓存的副本）"""
+        if not self._settings_dirty:
+            settings = self._settings_cache.copy()
+            settings['save_times'] = list(settings['save_times'])
+            return settings
+        
         settings = {
             'save_path': self.path_edit.text(),
             'capture_interval': self.interval_spin.value(),
             'buffer_size': self.buffer_size_spin.value(),
-            'save_times': [self.time_list.item(i).text() 
-                          for i in range(self.time_list.count())],
+            'image_format': self.format_combo.currentData(),
+            'image_quality': self.quality_spin.value(),
+            'save_times': list(self._times_sorted),
             'foreground_detection': self.foreground_check.isChecked(),
             'process_names': self.process_edit.text(),
             'ink_detection': self.ink_check.isChecked(),
@@ -1013,6 +1275,11 @@ class SmartBoardGUI(QMainWindow):
             'silent_start': self.silent_start_check.isChecked(),
             'minimize_to_tray': self.minimize_to_tray_check.isChecked()
         }
+        self._settings_cache = settings
+        self._settings_dirty = False
+        
+        settings = settings.copy()
+        settings['save_times'] = list(settings['save_times'])
         return settings
     
     def load_settings(self, config):
@@ -1027,6 +1294,12 @@ class SmartBoardGUI(QMainWindow):
         if 'buffer_size' in config:
             self.buffer_size_spin.setValue(int(config['buffer_size']))
         
+        if 'image_format' in config:
+            self.set_image_format(config['image_format'])
+        
+        if 'image_quality' in config:
+            self.quality_spin.setValue(int(config['image_quality']))
+        
         # 高级设置
         if 'foreground_detection' in config:
             self.foreground_check.setChecked(config['foreground_detection'])
@@ -1040,9 +1313,7 @@ class SmartBoardGUI(QMainWindow):
         
         # 时间设置
         if 'save_times' in config:
-            self.time_list.clear()
-            for time_str in config['save_times']:
-                self.time_list.addItem(time_str)
+            self.set_save_times(config['save_times'])
         
         # 系统设置
         if 'auto_start' in config:
@@ -1057,10 +1328,32 @@ class SmartBoardGUI(QMainWindow):
         # 更新体积估计
         self.update_volume_estimate.emit()
         # 检查进程
-        self.check_processes()
+        self.schedule_process_check()
+    
+    def queue_state(self, key, value):
+        """暂存界面状态，等待下一次合并刷新（同一项只保留最新值）"""
+        self._pending_state[key] = value
+        if not self._state_timer.isActive():
+            self._state_timer.start()
+    
+    def apply_pending_state(self):
+        """一次性把暂存的状态刷新到界面"""
+        state, self._pending_state = self._pending_state, {}
+        if 'buffer' in state:
+            self._apply_buffer_progress(*state['buffer'])
+        if 'capture_count' in state:
+            self.capture_count_label.setText(str(state['capture_count']))
+        if 'last_capture' in state:
+            self.last_capture_label.setText(f"最后截图: {state['last_capture']}")
+        if 'memory_usage' in state:
+            self.memory_usage_label.setText(f"内存使用: {state['memory_usage']}")
     
     def update_buffer_progress(self, current, maximum=100):
-        """更新缓冲区进度条"""
+        """更新缓冲区进度条（合并刷新）"""
+        self.queue_state('buffer', (current, maximum))
+    
+    def _apply_buffer_progress(self, current, maximum):
+        """刷新缓冲区进度条和数量"""
         if maximum <= 0:
             return
             
@@ -1073,83 +1366,86 @@ class SmartBoardGUI(QMainWindow):
         self.buffer_label.setText(f"{current_int}/{maximum_int}")
         
         # 缓冲区超过80%显示警告
-        if current_int / maximum_int >= 0.8:
-            self.buffer_progress.setStyleSheet("""
-                QProgressBar {
-                    border: 1px solid #d9d9d9;
-                    border-radius: 4px;
-                    text-align: center;
-                    background-color: white;
-                }
-                QProgressBar::chunk {
-                    background-color: #faad14;
-                    border-radius: 3px;
-                }
-            """)
-        else:
-            self.buffer_progress.setStyleSheet("""
-                QProgressBar {
-                    border: 1px solid #d9d9d9;
-                    border-radius: 4px;
-                    text-align: center;
-                    background-color: white;
-                }
-                QProgressBar::chunk {
-                    background-color: #52c41a;
-                    border-radius: 3px;
-                }
-            """)
+        self.set_buffer_level("warn" if current_int / maximum_int >= 0.8 else "ok")
+    
+    def set_buffer_level(self, level):
+        """切换缓冲区进度条的颜色（ok/warn，由全局样式表中的level属性选择器决定）"""
+        progress = self.buffer_progress
+        if progress.property("level") == level:
+            return
+        progress.setProperty("level", level)
+        progress.style().unpolish(progress)
+        progress.style().polish(progress)
     
     def update_capture_count(self, count):
-        """更新截图数量"""
-        self.capture_count_label.setText(str(count))
+        """更新截图数量（合并刷新）"""
+        self.queue_state('capture_count', count)
     
     def update_activity_status(self, is_active):
         """更新截图状态（保持方法兼容性）"""
         # 不再需要活动检测，但保持方法以兼容现有代码
         self.activity_label.setText("固定间隔")
-        self.activity_label.setStyleSheet("""
-            QLabel {
-                background-color: #1890ff;
-                color: white;
-                border: 1px solid #40a9ff;
-            }
-        """)
     
     def update_last_capture(self, timestamp):
-        """更新最后截图时间"""
-        self.last_capture_label.setText(f"最后截图: {timestamp}")
+        """更新最后截图时间（合并刷新）"""
+        self.queue_state('last_capture', timestamp)
     
     def update_memory_usage(self, usage):
-        """更新内存使用情况"""
-        self.memory_usage_label.setText(f"内存使用: {usage}")
+        """更新内存使用情况（合并刷新）"""
+        self.queue_state('memory_usage', usage)
     
     def update_next_save_time(self, time_str):
         """更新下次保存时间"""
         pass
     
+    def on_log_timer(self):
+        """刷新日志显示（只在日志页面可见时刷新）"""
+        if self.settings_tabs.currentWidget() is self.log_tab_widget:
+            self.update_log_display()
+    
     def update_log_display(self):
-        """更新日志显示"""
-        if self.log_manager:
-            logs = self.log_manager.get_logs()
-            self.log_browser.clear()
-            
-            for log in logs:
-                timestamp, level, message = log
-                color = "#52c41a" if level == "INFO" else "#ff4d4f" if level == "ERROR" else "#1890ff"
-                self.log_browser.append(f'<span style="color:#8c8c8c">[{timestamp}]</span> '
-                                       f'<span style="color:{color}"><b>{level}</b></span>: {message}')
-            
-            # 滚动到底部
-            cursor = self.log_browser.textCursor()
-            cursor.movePosition(QTextCursor.End)
-            self.log_browser.setTextCursor(cursor)
+        """更新日志显示（只追加新增的日志，一次性写入）"""
+        if not self.log_manager or self.log_browser is None:
+            return
+        
+        new_seq, logs = self.log_manager.pending_since(self._log_seq)
+        if not logs:
+            return
+        self._log_seq = new_seq
+        
+        # 纯文本追加，只给级别前缀加颜色
+        cursor = self._log_cursor
+        plain_format = self._log_plain_format
+        level_formats = self._log_level_formats
+        new_block = not self.log_browser.document().isEmpty()
+        cursor.beginEditBlock()
+        cursor.movePosition(QTextCursor.End)
+        for timestamp, level, message, line in logs:
+            if new_block:
+                cursor.insertBlock()
+            new_block = True
+            # 按位置切分预先生成的整行文本，不再逐段拼接字符串
+            level_start = len(timestamp) + 3
+            level_end = level_start + len(level) + 2
+            cursor.insertText(line[:level_start], plain_format)
+            cursor.insertText(line[level_start:level_end], level_formats.get(level, plain_format))
+            cursor.insertText(line[level_end:], plain_format)
+        cursor.endEditBlock()
+        
+        # 滚动到底部
+        self.log_browser.moveCursor(QTextCursor.End)
+    
+    def reload_log_display(self):
+        """重新显示全部日志"""
+        self.log_browser.clear()
+        self._log_seq = self.log_manager.get_first_seq() if self.log_manager else 0
+        self.update_log_display()
     
     def clear_log(self):
         """清空日志"""
         if self.log_manager:
             self.log_manager.clear_logs()
-            self.update_log_display()
+            self.reload_log_display()
     
     def save_log(self):
         """保存日志到文件"""
@@ -1164,6 +1460,48 @@ class SmartBoardGUI(QMainWindow):
                 else:
                     QMessageBox.warning(self, "警告", "日志保存失败！")
     
+    def showEvent(self, event):
+        """窗口显示时启动界面刷新定时器"""
+        super().showEvent(event)
+        if not self.isMinimized():
+            self.resume_timers()
+    
+    def hideEvent(self, event):
+        """窗口隐藏（包括最小化到托盘）时停止界面刷新定时器"""
+        super().hideEvent(event)
+        self.pause_timers()
+    
+    def changeEvent(self, event):
+        """窗口最小化时停止界面刷新定时器，还原时重新启动"""
+        super().changeEvent(event)
+        if event.type() == QEvent.WindowStateChange:
+            if self.isMinimized():
+                self.pause_timers()
+            elif self.isVisible():
+                self.resume_timers()
+    
+    def pause_timers(self):
+        """停止进程检测和日志刷新"""
+        self.process_check_timer.stop()
+        self._process_refresh_timer.stop()
+        self.log_timer.stop()
+    
+    def resume_timers(self):
+        """立即刷新一次并重新启动进程检测，补上隐藏期间的日志"""
+        if not self.process_check_timer.isActive():
+            self.request_process_scan()
+            self.process_check_timer.start()
+        self.on_log_timer()
+    
+    def schedule_log_refresh(self):
+        """日志更新后安排一次显示刷新（窗口不可见时不刷新，显示时再补上）"""
+        if self.isVisible() and not self.isMinimized() and not self.log_timer.isActive():
+            self.log_timer.start()
+    
+    def schedule_process_check(self):
+        """安排一次进程状态检查，300毫秒内的多次请求合并为一次"""
+        self._process_refresh_timer.start()
+    
     def closeEvent(self, event):
         """窗口关闭事件"""
         if self.config.get('minimize_to_tray', True):
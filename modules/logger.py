@@ -5,47 +5,72 @@
 """
 
 import os
+from collections import deque
 from datetime import datetime
-from PyQt5.QtCore import QObject, pyqtSignal
+from itertools import islice
+from threading import Lock
+from PyQt5.QtCore import QObject, Qt, pyqtSignal
 
 class LogManager(QObject):
     """日志管理器"""
     
     log_updated = pyqtSignal()  # 日志更新信号
+    log_signal = pyqtSignal(str, str)  # 其他线程提交日志的信号（级别，消息）
     
     def __init__(self, max_logs=1000):
         super().__init__()
-        self.logs = []
+        self.logs = deque(maxlen=max_logs)  # 超过max_logs条时自动丢弃最早的日志
         self.max_logs = max_logs
+        self.total_logs = 0  # 累计添加的日志条数（不受清空和数量限制影响），用于增量获取
+        self.lock = Lock()  # 保存线程也会写日志，遍历deque时不能同时追加
+        # 截图和保存线程通过信号提交日志，排队到本对象所在线程再添加
+        self.log_signal.connect(self.add_log, Qt.QueuedConnection)
     
     def add_log(self, level, message):
         """添加日志"""
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        log_entry = (timestamp, level, message)
-        self.logs.append(log_entry)
-        
-        # 限制日志数量
-        if len(self.logs) > self.max_logs:
-            self.logs = self.logs[-self.max_logs:]
+        # 整行文本在添加时生成一次，显示和保存时直接使用
+        line = f"[{timestamp}] {level}: {message}"
+        log_entry = (timestamp, level, message, line)
+        with self.lock:
+            self.logs.append(log_entry)
+            self.total_logs += 1
         
         # 发射更新信号
         self.log_updated.emit()
     
     def get_logs(self):
         """获取所有日志"""
-        return self.logs.copy()
+        with self.lock:
+            return list(self.logs)
+    
+    def pending_since(self, seq):
+        """获取序号seq之后新增的日志，返回 (新序号, [(时间, 级别, 消息, 整行文本), ...])"""
+        with self.lock:
+            total = self.total_logs
+            new_count = total - seq
+            if new_count <= 0:
+                return total, []
+            return total, self._tail(new_count)
+    
+    def get_first_seq(self):
+        """获取当前保留的最早一条日志之前的序号（从该序号开始可取到全部保留的日志）"""
+        with self.lock:
+            return self.total_logs - len(self.logs)
     
     def clear_logs(self):
         """清空日志"""
-        self.logs.clear()
+        with self.lock:
+            self.logs.clear()
         self.log_updated.emit()
     
     def save_to_file(self, filepath):
         """保存日志到文件"""
         try:
             with open(filepath, 'w', encoding='utf-8') as f:
-                for timestamp, level, message in self.logs:
-                    f.write(f"[{timestamp}] {level}: {message}\n")
+                for entry in self.get_logs():
+                    f.write(entry[3])
+                    f.write("\n")
             return True
         except Exception as e:
             self.add_log("ERROR", f"保存日志失败: {str(e)}")
@@ -53,4 +78,11 @@ class LogManager(QObject):
     
     def get_recent_logs(self, count=50):
         """获取最近的日志"""
-        return self.logs[-count:] if len(self.logs) > count else self.logs
+        with self.lock:
+            return self._tail(count)
+    
+    def _tail(self, count):
+        """从右端取最近count条日志（按时间顺序），只遍历取出的部分"""
+        tail = list(islice(reversed(self.logs), count))
+        tail.reverse()
+        return tail
@@ -5,39 +5,283 @@
 """
 
 import os
+import hashlib
+from collections import OrderedDict
 from datetime import datetime
+from threading import Lock
 from PyQt5.QtWidgets import QApplication
-from PyQt5.QtGui import QPixmap, QScreen
-from PyQt5.QtCore import QBuffer, QIODevice
+from PyQt5.QtGui import QPixmap, QScreen, QImage, QPainter
+from PyQt5.QtCore import QBuffer, QIODevice, QSemaphore, QMutex
 import win32gui
 import win32process
 import psutil
 
+# 用GDI直接截取全屏需要win32ui，不可用时使用Qt截图
+try:
+    import win32api
+    import win32con
+    import win32ui
+except ImportError:
+    win32ui = None
+
+# BitBlt光栅操作附加标志：同时复制分层窗口（画笔、批注等悬浮层常是分层窗口）
+CAPTUREBLT = 0x40000000
+
+# xxhash为可选依赖，未安装时使用标准库的blake2b
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+# 截图编码格式：配置值 -> (Qt格式名, 文件扩展名, 默认编码质量)
+# PNG的质量值对应zlib压缩级别，80约为级别1（压缩最快，仍为无损）
+IMAGE_FORMATS = {
+    'jpg': ('JPG', 'jpg', 85),
+    'webp': ('WEBP', 'webp', 85),
+    'png': ('PNG', 'png', 80),
+}
+
+# 窗口所属进程名缓存的最大条数
+PROCESS_NAME_CACHE_SIZE = 64
+
+def normalize_process_names(process_names):
+    """将进程名规范化为小写、带.exe后缀的集合（设置变更时生成一次，截图时直接匹配）"""
+    names = set()
+    for name in process_names:
+        name = name.strip().lower()
+        if not name:
+            continue
+        if not name.endswith('.exe'):
+            name = f"{name}.exe"
+        names.add(name)
+    return frozenset(names)
+
+class FrameBufferPool:
+    """预分配的截图帧缓冲池，截图写入借出的槽位，处理完后归还，避免每帧重新分配"""
+    
+    def __init__(self, slot_count):
+        self.slot_count = slot_count
+        self.frames = [QImage() for _ in range(slot_count)]
+        self.free_slots = list(range(slot_count))
+        self.semaphore = QSemaphore(slot_count)
+        self.lock = Lock()
+    
+    def acquire(self, timeout_ms=0):
+        """借出一个空闲槽位，超时仍无空闲槽位时返回None"""
+        if not self.semaphore.tryAcquire(1, timeout_ms):
+            return None
+        with self.lock:
+            return self.free_slots.pop()
+    
+    def release(self, slot):
+        """归还槽位"""
+        with self.lock:
+            self.free_slots.append(slot)
+        self.semaphore.release()
+    
+    def frame(self, slot, width, height):
+        """获取槽位中的图像，尺寸变化时才重新分配"""
+        image = self.frames[slot]
+        if image.width() != width or image.height() != height:
+            image = QImage(width, height, QImage.Format_RGB32)
+            self.frames[slot] = image
+        return image
+    
+    def image(self, slot):
+        """获取槽位中当前的图像"""
+        return self.frames[slot]
+
+class GdiScreenGrabber:
+    """用GDI BitBlt将屏幕复制到持久的兼容位图中，尺寸不变时复用设备上下文和位图"""
+    
+    def __init__(self):
+        self._screen_dc = None
+        self._src_dc = None
+        self._mem_dc = None
+        self._bitmap = None
+        self._size = None
+    
+    def _prepare(self, width, height):
+        """按截图尺寸准备设备上下文和位图，尺寸变化时才重新创建"""
+        if self._size == (width, height):
+            return
+        self.close()
+        self._screen_dc = win32gui.GetWindowDC(0)
+        self._src_dc = win32ui.CreateDCFromHandle(self._screen_dc)
+        self._mem_dc = self._src_dc.CreateCompatibleDC()
+        self._bitmap = win32ui.CreateBitmap()
+        self._bitmap.CreateCompatibleBitmap(self._src_dc, width, height)
+        self._mem_dc.SelectObject(self._bitmap)
+        self._size = (width, height)
+    
+    def grab(self, x, y, width, height):
+        """截取屏幕区域，返回32位BGRX像素数据（每行width*4字节）"""
+        self._prepare(width, height)
+        self._mem_dc.BitBlt((0, 0), (width, height), self._src_dc, (x, y), win32con.SRCCOPY | CAPTUREBLT)
+        return self._bitmap.GetBitmapBits(True)
+    
+    def close(self):
+        """释放设备上下文和位图"""
+        if self._size is None:
+            return
+        win32gui.DeleteObject(self._bitmap.GetHandle())
+        self._mem_dc.DeleteDC()
+        self._src_dc.DeleteDC()
+        win32gui.ReleaseDC(0, self._screen_dc)
+        self._screen_dc = self._src_dc = self._mem_dc = self._bitmap = None
+        self._size = None
+
 class ScreenshotManager:
     """管理截图功能"""
     
-    def __init__(self):
-        self.screens = QApplication.screens()
+    def __init__(self, log_manager=None):
+        self.log_manager = log_manager
+        
+        # 缓存主屏幕，显示器插拔或主屏幕变化时才重新获取
+        app = QApplication.instance()
+        self.primary_screen = app.primaryScreen()
+        app.screenAdded.connect(self._refresh_primary_screen)
+        app.screenRemoved.connect(self._refresh_primary_screen)
+        app.primaryScreenChanged.connect(self._refresh_primary_screen)
+        self.image_format = 'jpg'
+        self.image_quality = None  # 有损格式的编码质量，None时使用格式默认值
+        
+        # 可复用的编码缓冲区，避免每帧重新分配
+        self._enc_buf = QBuffer()
+        self._enc_buf.open(QIODevice.ReadWrite)
+        self._enc_mutex = QMutex()
+        
+        # 全屏截图的GDI截取器（在截图线程中首次截图时创建）和上一帧的摘要
+        self._use_gdi = win32ui is not None
+        self._gdi_grabber = None
+        self._last_frame_digest = None
+        
+        # 窗口进程名缓存：(窗口句柄, 进程ID) -> 小写进程名（LRU，只在截图线程中访问）
+        self._process_name_cache = OrderedDict()
+    
+    def _log(self, level, message):
+        """通过日志信号记录日志（排队到主线程处理，不阻塞截图和保存线程）"""
+        if self.log_manager:
+            self.log_manager.log_signal.emit(level, message)
+    
+    def _refresh_primary_screen(self, *args):
+        """显示器配置变化后重新获取主屏幕"""
+        self.primary_screen = QApplication.primaryScreen()
+    
+    def set_image_format(self, image_format):
+        """设置截图编码格式（jpg/webp/png），不支持的格式使用jpg"""
+        image_format = str(image_format).lower()
+        self.image_format = image_format if image_format in IMAGE_FORMATS else 'jpg'
     
-    def capture_screen(self):
-        """截取整个屏幕"""
+    def set_image_quality(self, quality):
+        """设置有损格式（jpg/webp）的编码质量（1-100），PNG不受影响"""
         try:
-            screen = self.screens[0]  # 主屏幕
-            pixmap = screen.grabWindow(0)
-            return pixmap
+            self.image_quality = min(max(int(quality), 1), 100)
+        except (TypeError, ValueError):
+            self.image_quality = None
+    
+    def get_file_extension(self):
+        """获取当前编码格式对应的文件扩展名"""
+        return IMAGE_FORMATS[self.image_format][1]
+    
+    def get_encode_params(self):
+        """获取当前编码参数 (Qt格式名, 文件扩展名, 编码质量)，有损格式使用设置的质量"""
+        qt_format, extension, quality = IMAGE_FORMATS[self.image_format]
+        if qt_format != 'PNG' and self.image_quality is not None:
+            quality = self.image_quality
+        return qt_format, extension, quality
+    
+    def reset_frame_history(self):
+        """清除上一帧摘要，下一次截图不会被当作未变化而跳过"""
+        self._last_frame_digest = None
+    
+    def _frame_changed(self, data):
+        """与上一帧的像素摘要比较，画面未变化时返回False"""
+        if xxhash:
+            digest = xxhash.xxh3_64_intdigest(data)
+        else:
+            digest = hashlib.blake2b(data, digest_size=8).digest()
+        if digest == self._last_frame_digest:
+            return False
+        self._last_frame_digest = digest
+        return True
+    
+    def _grab_screen_gdi(self, pool, slot):
+        """用GDI截取主屏幕，画面与上一帧相同时返回None（无需编码）"""
+        if self._gdi_grabber is None:
+            self._gdi_grabber = GdiScreenGrabber()
+        width = win32api.GetSystemMetrics(win32con.SM_CXSCREEN)
+        height = win32api.GetSystemMetrics(win32con.SM_CYSCREEN)
+        data = self._gdi_grabber.grab(0, 0, width, height)
+        if not self._frame_changed(data):
+            return None
+        
+        if pool is None:
+            return QImage(data, width, height, QImage.Format_RGB32).copy()
+        image = pool.frame(slot, width, height)
+        size = image.byteCount()
+        if len(data) != size:
+            # 显示器不是32位色时像素格式不一致，之后都改用Qt截图
+            self._use_gdi = False
+            self._last_frame_digest = None
+            raise ValueError(f"GDI像素数据大小不符: {len(data)} != {size}")
+        bits = image.bits()
+        bits.setsize(size)
+        memoryview(bits)[:] = data
+        return image
+    
+    def _copy_to_pool(self, pixmap, pool, slot):
+        """将截图绘制到缓冲池槽位中，返回槽位图像；画面与上一帧相同时返回None"""
+        if pixmap.isNull():
+            return None
+        image = pool.frame(slot, pixmap.width(), pixmap.height())
+        painter = QPainter(image)
+        painter.drawPixmap(0, 0, pixmap)
+        painter.end()
+        
+        bits = image.constBits()
+        bits.setsize(image.byteCount())
+        if not self._frame_changed(memoryview(bits)):
+            return None
+        return image
+    
+    def capture_screen(self, pool=None, slot=None):
+        """截取整个屏幕，返回QImage
+
+        指定pool和slot时截图写入缓冲池槽位并返回该槽位的QImage，
+        画面与上一帧相同时返回None
+        """
+        if self._use_gdi:
+            try:
+                return self._grab_screen_gdi(pool, slot)
+            except Exception as e:
+                self._log("WARNING", f"GDI截图失败，改用Qt截图: {e}")
+                # 下一次截图重新创建设备上下文
+                if self._gdi_grabber is not None:
+                    self._gdi_grabber.close()
+        try:
+            pixmap = self.primary_screen.grabWindow(0)
+            if pool is not None:
+                return self._copy_to_pool(pixmap, pool, slot)
+            # 只做一次显存到内存的回读，之后编码和保存都使用QImage
+            return pixmap.toImage()
         except Exception as e:
-            print(f"截图失败: {e}")
+            self._log("ERROR", f"截图失败: {e}")
             return None
     
-    def capture_foreground_window(self, process_names=None):
-        """截取前台窗口"""
+    def capture_foreground_window(self, target_names=None, pool=None, slot=None):
+        """截取前台窗口，返回QImage
+
+        指定pool和slot时截图写入缓冲池槽位并返回该槽位的QImage，
+        画面与上一帧相同时返回None
+        """
         try:
             # 获取前台窗口句柄
             hwnd = win32gui.GetForegroundWindow()
             
             # 如果指定了进程名，检查是否匹配
-            if process_names:
-                if not self._is_target_process(hwnd, process_names):
+            if target_names:
+                if not self._is_target_process(hwnd, target_names):
                     return None
             
             # 获取窗口位置和大小
@@ -45,61 +289,69 @@ class ScreenshotManager:
             x, y, width, height = rect
             
             # 截取窗口
-            screen = self.screens[0]
-            pixmap = screen.grabWindow(0, x, y, width, height)
-            return pixmap
+            pixmap = self.primary_screen.grabWindow(0, x, y, width, height)
+            if pool is not None:
+                return self._copy_to_pool(pixmap, pool, slot)
+            # 只做一次显存到内存的回读，之后编码和保存都使用QImage
+            return pixmap.toImage()
             
         except Exception as e:
-            print(f"窗口截图失败: {e}")
+            self._log("ERROR", f"窗口截图失败: {e}")
             return None
     
-    def _is_target_process(self, hwnd, process_names):
-        """检查窗口是否属于目标进程"""
+    def _is_target_process(self, hwnd, target_names):
+        """检查窗口是否属于目标进程（target_names为normalize_process_names的结果）"""
         try:
             _, pid = win32process.GetWindowThreadProcessId(hwnd)
-            process = psutil.Process(pid)
-            process_name = process.name().lower()
-            
-            for target_name in process_names:
-                # 清理进程名，确保有.exe后缀
-                target_name = target_name.strip().lower()
-                if not target_name.endswith('.exe'):
-                    target_name = f"{target_name}.exe"
-                
-                if target_name in process_name:
-                    return True
+            return self._get_process_name(hwnd, pid) in target_names
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            # 窗口所属进程已退出或无权访问，属于正常情况
             return False
         except Exception as e:
-            print(f"检查进程失败: {e}")
+            self._log("ERROR", f"检查进程失败: {e}")
             return False
     
-    def save_to_memory(self, pixmap):
-        """将截图保存到内存"""
-        try:
-            buffer = QBuffer()
-            buffer.open(QIODevice.ReadWrite)
-            pixmap.save(buffer, "PNG")
-            return buffer.data()
-        except Exception as e:
-            print(f"保存到内存失败: {e}")
-            return None
+    def _get_process_name(self, hwnd, pid):
+        """获取窗口所属进程的小写进程名，同一窗口和进程ID只查询一次psutil
+
+        窗口随进程结束而销毁，句柄和进程ID都相同时一定是同一个进程
+        """
+        key = (hwnd, pid)
+        cache = self._process_name_cache
+        process_name = cache.get(key)
+        if process_name is None:
+            process_name = psutil.Process(pid).name().lower()
+            cache[key] = process_name
+            if len(cache) > PROCESS_NAME_CACHE_SIZE:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(key)
+        return process_name
     
-    def save_to_file(self, pixmap, filepath):
-        """将截图保存到文件"""
+    def save_to_memory(self, image, out=None):
+        """将截图按当前编码格式保存到内存（可直接交给缓冲区持有）
+
+        传入out（bytearray）时将编码结果复制到out中并返回out，否则返回新的bytes
+        """
         try:
-            # 确保目录存在
-            os.makedirs(os.path.dirname(filepath), exist_ok=True)
-            
-            # 生成带时间戳的文件名
-            timestamp = datetime.now()
-            filename = timestamp.strftime("%Y-%m-%d-%H-%M-%S.png")
-            full_path = os.path.join(filepath, filename)
-            
-            pixmap.save(full_path, "PNG")
-            return True
+            qt_format, _, quality = self.get_encode_params()
+            self._enc_mutex.lock()
+            try:
+                # 从头覆盖写入复用的缓冲区，只取本次写入的部分
+                self._enc_buf.seek(0)
+                image.save(self._enc_buf, qt_format, quality)
+                size = self._enc_buf.pos()
+                # 通过memoryview只复制一次编码数据（left()会先生成一份副本）
+                view = memoryview(self._enc_buf.data())[:size]
+                if out is None:
+                    return bytes(view)
+                out[:] = view
+                return out
+            finally:
+                self._enc_mutex.unlock()
         except Exception as e:
-            print(f"保存到文件失败: {e}")
-            return False
+            self._log("ERROR", f"保存到内存失败: {e}")
+            return None
     
     def get_timestamp(self):
         """获取当前时间戳"""
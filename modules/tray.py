@@ -6,11 +6,32 @@
 
 import sys
 import os
+import time
 from PyQt5.QtWidgets import (QApplication, QSystemTrayIcon, QMenu, 
                              QAction, QMessageBox)
-from PyQt5.QtGui import QIcon, QPixmap
+from PyQt5.QtGui import QIcon, QPixmap, QPainter, QColor
 from PyQt5.QtCore import QTimer, pyqtSignal
 
+# 托盘图标只绘制一次，之后直接复用
+_TRAY_ICON = None
+
+def get_tray_icon():
+    """获取托盘图标（首次调用时绘制）"""
+    global _TRAY_ICON
+    if _TRAY_ICON is None:
+        # 创建一个简单的程序图标
+        pixmap = QPixmap(32, 32)
+        pixmap.fill(QApplication.palette().window().color())
+        
+        # 添加一个简单的标识
+        painter = QPainter(pixmap)
+        painter.setBrush(QColor(24, 144, 255))  # 蓝色
+        painter.drawRect(8, 8, 16, 16)
+        painter.end()
+        
+        _TRAY_ICON = QIcon(pixmap)
+    return _TRAY_ICON
+
 class SystemTrayManager(QSystemTrayIcon):
     show_window_signal = pyqtSignal()
     hide_window_signal = pyqtSignal()
@@ -22,6 +43,9 @@ class SystemTrayManager(QSystemTrayIcon):
         self.app = app
         self.window_visible = True
         
+        # 最近显示过的消息 {hash((标题, 内容)): 显示时间}，用于5秒内去重
+        self._recent_messages = {}
+        
         # 创建托盘图标
         self.create_icon()
         
@@ -33,18 +57,7 @@ class SystemTrayManager(QSystemTrayIcon):
     
     def create_icon(self):
         """创建托盘图标"""
-        # 创建一个简单的程序图标
-        pixmap = QPixmap(32, 32)
-        pixmap.fill(QApplication.palette().window().color())
-        
-        # 添加一个简单的标识
-        from PyQt5.QtGui import QPainter, QColor
-        painter = QPainter(pixmap)
-        painter.setBrush(QColor(24, 144, 255))  # 蓝色
-        painter.drawRect(8, 8, 16, 16)
-        painter.end()
-        
-        self.setIcon(QIcon(pixmap))
+        self.setIcon(get_tray_icon())
         self.setToolTip("智能板书监控")
     
     def create_menu(self):
@@ -137,5 +150,15 @@ class SystemTrayManager(QSystemTrayIcon):
         self.quit_app_signal.emit()
     
     def show_message(self, title, message, timeout=3000):
-        """显示托盘消息"""
+        """显示托盘消息（5秒内相同的消息只显示一次）"""
+        now = time.monotonic()
+        if self._recent_messages:
+            self._recent_messages = {key: shown for key, shown in self._recent_messages.items()
+                                     if now - shown < 5}
+        
+        key = hash((title, message))
+        if key in self._recent_messages:
+            return
+        self._recent_messages[key] = now
+        
         self.showMessage(title, message, QSystemTrayIcon.Information, timeout)